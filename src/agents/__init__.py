@@ -4,6 +4,7 @@ from .sdk_agent import sdk_agent, SDKAgent
 from .framework_router import framework_router, FrameworkRouter, FrameworkSpecialist
 from .code_generator import code_generator, CodeGenerator
 from .orchestrator import chat_orchestrator, ChatOrchestrator
+from .types import IntentClassification, CodeResponse, FrameworkName, QueryResult
 
 __all__ = [
     "sdk_agent",
@@ -15,4 +16,8 @@ __all__ = [
     "CodeGenerator",
     "chat_orchestrator",
     "ChatOrchestrator",
+    "IntentClassification",
+    "CodeResponse",
+    "FrameworkName",
+    "QueryResult",
 ]
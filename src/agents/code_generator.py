@@ -1,11 +1,22 @@
 """Code Generator Agent - Generates working code examples."""
 
-from typing import Dict, Optional
+import logging
+from types import MappingProxyType
+from typing import Dict, Mapping, Optional
 from langchain_openai import ChatOpenAI
 import mvk_sdk as mvk
 
 from ..utils.config import config
-from ..prompts import CODE_GENERATOR_PROMPT
+from ..utils.http import SHARED_HTTPX
+from ..utils.llm_cache import cached_invoke, make_cache_key, normalize_query
+from ..prompts import CODE_GENERATOR_PROMPT_PREFIX, CODE_GENERATOR_PROMPT_SUFFIX
+from .types import CodeResponse
+
+
+logger = logging.getLogger(__name__)
+
+SYSTEM_MSG_CODE = {"role": "system", "content": "You are an expert code generator for MVK SDK integration."}
+_BASE_MESSAGES_CODE = [SYSTEM_MSG_CODE, {"role": "user", "content": None}]
 
 
 class CodeGenerator:
@@ -16,9 +27,19 @@ class CodeGenerator:
         self.llm = ChatOpenAI(
             model=config.LLM_MODEL,
             temperature=config.LLM_TEMPERATURE_CODE,
-            openai_api_key=config.OPENAI_API_KEY
+            openai_api_key=config.OPENAI_API_KEY,
+            http_client=SHARED_HTTPX
         )
 
+        # Returns a validated CodeResponse instead of markdown sections
+        self.structured_llm = self.llm.with_structured_output(CodeResponse)
+
+        # Config is fixed at startup, so stats are built once and shared read-only
+        self._stats = MappingProxyType({
+            "model": config.LLM_MODEL,
+            "temperature": config.LLM_TEMPERATURE_CODE
+        })
+
     @mvk.signal(step_type="AGENT", operation="code_generation")
     def generate(
         self,
@@ -44,33 +65,27 @@ class CodeGenerator:
                 sdk_ctx = sdk_context or "No specific SDK context provided."
                 framework_ctx = framework_context or "No specific framework context provided."
 
-                # Stage 1: Code generation
-                with mvk.context(name="stage.generation"):
-                    prompt = CODE_GENERATOR_PROMPT.format(
-                        user_query=user_query,
-                        sdk_context=sdk_ctx,
-                        framework_context=framework_ctx
-                    )
-
-                    # LLM call is auto-tracked by MVK SDK
-                    response = self.llm.invoke([
-                        {"role": "system", "content": "You are an expert code generator for MVK SDK integration."},
-                        {"role": "user", "content": prompt}
-                    ])
-
-                    raw_response = response.content
+                cache_key = make_cache_key(
+                    "code_generator",
+                    normalize_query(user_query),
+                    sdk_ctx,
+                    framework_ctx,
+                    temperature=config.LLM_TEMPERATURE_CODE
+                )
 
-                # Stage 2: Response parsing
-                with mvk.context(name="stage.parsing"):
-                    parsed = self._parse_response(raw_response)
+                generated = cached_invoke(
+                    cache_key,
+                    lambda: self._generate(user_query, sdk_ctx, framework_ctx),
+                    temperature=config.LLM_TEMPERATURE_CODE
+                )
 
                 return {
-                    **parsed,
+                    **generated,
                     "success": True
                 }
 
             except Exception as e:
-                print(f"❌ Code Generator error: {e}")
+                logger.exception("❌ Code Generator error")
 
                 return {
                     "code": f"# Error generating code: {str(e)}",
@@ -80,70 +95,31 @@ class CodeGenerator:
                     "success": False
                 }
 
-    def _parse_response(self, response: str) -> Dict[str, str]:
-        """
-        Parse LLM response to extract code, explanation, cost, and gotchas.
-
-        Args:
-            response: Raw LLM response
-
-        Returns:
-            Dictionary with parsed components
-        """
-        # Initialize result
-        result = {
-            "code": "",
-            "explanation": "",
-            "cost_estimate": "",
-            "gotchas": ""
-        }
-
-        # Extract code blocks
-        if "```python" in response:
-            parts = response.split("```python")
-            if len(parts) > 1:
-                code_part = parts[1].split("```")[0]
-                result["code"] = code_part.strip()
-
-        # Extract explanation
-        if "**Explanation:**" in response or "Explanation:" in response:
-            explanation_marker = "**Explanation:**" if "**Explanation:**" in response else "Explanation:"
-            parts = response.split(explanation_marker)
-            if len(parts) > 1:
-                explanation_text = parts[1].split("**")[0] if "**" in parts[1] else parts[1]
-                result["explanation"] = explanation_text.strip()
-
-        # Extract cost estimate
-        if "**Estimated Cost:**" in response or "Estimated Cost:" in response or "**Cost Estimate:**" in response:
-            cost_marker = "**Estimated Cost:**" if "**Estimated Cost:**" in response else \
-                         "**Cost Estimate:**" if "**Cost Estimate:**" in response else "Estimated Cost:"
-            parts = response.split(cost_marker)
-            if len(parts) > 1:
-                cost_text = parts[1].split("**")[0] if "**" in parts[1] else parts[1]
-                result["cost_estimate"] = cost_text.strip()
-
-        # Extract gotchas
-        if "**Gotchas:**" in response or "Gotchas:" in response:
-            gotchas_marker = "**Gotchas:**" if "**Gotchas:**" in response else "Gotchas:"
-            parts = response.split(gotchas_marker)
-            if len(parts) > 1:
-                gotchas_text = parts[1].split("**")[0] if "**" in parts[1] else parts[1]
-                result["gotchas"] = gotchas_text.strip()
-
-        # If code wasn't extracted, use the whole response
-        if not result["code"] and "```" in response:
-            parts = response.split("```")
-            if len(parts) > 1:
-                result["code"] = parts[1].strip()
-
-        return result
-
-    def get_stats(self) -> Dict[str, any]:
-        """Get Code Generator statistics."""
-        return {
-            "model": config.LLM_MODEL,
-            "temperature": config.LLM_TEMPERATURE_CODE
-        }
+    def _generate(self, user_query: str, sdk_ctx: str, framework_ctx: str) -> Dict[str, str]:
+        """Call the LLM for a structured code response."""
+        # Stage 1: Code generation
+        with mvk.context(name="stage.generation"):
+            # Only the short dynamic suffix is formatted
+            prompt = "".join((
+                CODE_GENERATOR_PROMPT_PREFIX,
+                CODE_GENERATOR_PROMPT_SUFFIX.format(
+                    user_query=user_query,
+                    sdk_context=sdk_ctx,
+                    framework_context=framework_ctx
+                )
+            ))
+
+            messages = _BASE_MESSAGES_CODE.copy()
+            messages[1] = {"role": "user", "content": prompt}
+
+            # LLM call is auto-tracked by MVK SDK
+            response = self.structured_llm.invoke(messages)
+
+        return response.model_dump()
+
+    def get_stats(self) -> Mapping[str, any]:
+        """Get Code Generator statistics (read-only)."""
+        return self._stats
 
 
 # Export singleton instance
@@ -1,12 +1,17 @@
 """Framework Router - Routes to framework-specific specialists."""
 
-from typing import Dict, Optional
+import functools
+from typing import Dict, Optional, get_args
 from langchain_openai import ChatOpenAI
 import mvk_sdk as mvk
 
 from ..utils.config import config
+from ..utils.http import SHARED_HTTPX
+from ..utils.llm_cache import cached_invoke, make_cache_key, normalize_query
+from ..utils.semantic_cache import SemanticCache
 from ..tools.tavily_search import tavily_search
-from ..prompts import FRAMEWORK_SPECIALIST_PROMPT
+from ..prompts import FRAMEWORK_SPECIALIST_PROMPT_PREFIX, FRAMEWORK_SPECIALIST_PROMPT_SUFFIX
+from .types import FrameworkName
 
 
 class FrameworkSpecialist:
@@ -23,9 +28,17 @@ class FrameworkSpecialist:
         self.llm = ChatOpenAI(
             model=config.LLM_MODEL,
             temperature=config.LLM_TEMPERATURE_FRAMEWORK,
-            openai_api_key=config.OPENAI_API_KEY
+            openai_api_key=config.OPENAI_API_KEY,
+            http_client=SHARED_HTTPX
         )
 
+        # Static per specialist, so built once rather than per request
+        self.system_message = {"role": "system", "content": f"You are a {framework_name} expert."}
+        self._base_messages = [self.system_message, {"role": "user", "content": None}]
+
+        # One cache per specialist so frameworks never share answers
+        self.semantic_cache = SemanticCache()
+
     @mvk.signal(step_type="AGENT", operation="framework_search")
     def query(self, question: str) -> Dict[str, any]:
         """
@@ -40,6 +53,12 @@ class FrameworkSpecialist:
         # Identify this agent with framework name
         with mvk.context(agent_name=f"framework_specialist_{self.framework_name}"):
             try:
+                # Serve semantically equivalent questions from cache
+                cache_text = f"{self.framework_name}|{question}"
+                hit, _similarity, cached = self.semantic_cache.get(cache_text)
+                if hit:
+                    return cached
+
                 # Stage 1: Web search for framework documentation
                 with mvk.context(name="stage.web_search"):
                     # Perform Tavily search (tavily_search handles its own tracking)
@@ -61,19 +80,18 @@ class FrameworkSpecialist:
 
                 # Stage 2: Synthesize answer from search results
                 with mvk.context(name="stage.synthesis"):
-                    prompt = FRAMEWORK_SPECIALIST_PROMPT.format(
-                        framework_name=self.framework_name.capitalize(),
-                        search_results=context,
-                        question=question
+                    cache_key = make_cache_key(
+                        "framework_specialist",
+                        self.framework_name,
+                        normalize_query(question),
+                        temperature=config.LLM_TEMPERATURE_FRAMEWORK
                     )
 
-                    # LLM call is auto-tracked by MVK SDK
-                    response = self.llm.invoke([
-                        {"role": "system", "content": f"You are a {self.framework_name} expert."},
-                        {"role": "user", "content": prompt}
-                    ])
-
-                    answer = response.content
+                    answer = cached_invoke(
+                        cache_key,
+                        lambda: self._synthesize(question, context),
+                        temperature=config.LLM_TEMPERATURE_FRAMEWORK
+                    )
 
                 # Extract sources
                 sources = [
@@ -85,13 +103,18 @@ class FrameworkSpecialist:
                     for result in search_results
                 ]
 
-                return {
+                result = {
                     "answer": answer,
                     "sources": sources,
                     "framework": self.framework_name,
                     "success": True
                 }
 
+                if sources:
+                    self.semantic_cache.set(cache_text, result)
+
+                return result
+
             except Exception as e:
                 print(f"❌ Framework Specialist ({self.framework_name}) error: {e}")
 
@@ -102,37 +125,56 @@ class FrameworkSpecialist:
                     "success": False
                 }
 
+    def _synthesize(self, question: str, context: str) -> str:
+        """Call the LLM to answer from search result context."""
+        # Only the short dynamic suffix is formatted
+        prompt = "".join((
+            FRAMEWORK_SPECIALIST_PROMPT_PREFIX,
+            FRAMEWORK_SPECIALIST_PROMPT_SUFFIX.format(
+                framework_name=self.framework_name.capitalize(),
+                search_results=context,
+                question=question
+            )
+        ))
+
+        messages = self._base_messages.copy()
+        messages[1] = {"role": "user", "content": prompt}
+
+        # LLM call is auto-tracked by MVK SDK
+        response = self.llm.invoke(messages)
+
+        return response.content
+
 
 class FrameworkRouter:
     """Routes queries to appropriate framework specialists."""
 
     def __init__(self):
-        """Initialize framework router with specialists."""
-        self.specialists = {
-            "langchain": FrameworkSpecialist("langchain"),
-            "llamaindex": FrameworkSpecialist("llamaindex"),
-            "crewai": FrameworkSpecialist("crewai"),
-            "autogen": FrameworkSpecialist("autogen"),
-            "haystack": FrameworkSpecialist("haystack"),
-            "generic": FrameworkSpecialist("generic"),
+        """Initialize framework router with specialist factories."""
+        # Specialists (and their LLM clients) are only built on first use
+        self._factory = {
+            name: (lambda n=name: FrameworkSpecialist(n))
+            for name in get_args(FrameworkName)
         }
 
-    def query(self, question: str, framework: Optional[str] = None) -> Dict[str, any]:
+    @functools.lru_cache(maxsize=None)
+    def _get(self, name: str) -> FrameworkSpecialist:
+        """Get the specialist for a framework, constructing it on first use."""
+        return self._factory[name]()
+
+    def query(self, question: str, framework: Optional[FrameworkName] = None) -> Dict[str, any]:
         """
         Route query to appropriate framework specialist.
 
         Args:
             question: User's question
-            framework: Framework name (if None, uses generic)
+            framework: Framework name from intent classification (if None, uses generic)
 
         Returns:
             Dictionary with answer and sources
         """
-        # Normalize framework name
-        framework = (framework or "generic").lower()
-
-        # Get specialist (fallback to generic)
-        specialist = self.specialists.get(framework, self.specialists["generic"])
+        # Intent classification guarantees a supported name
+        specialist = self._get(framework or "generic")
 
         # Query specialist (already instrumented with @mvk.signal())
         result = specialist.query(question)
@@ -141,7 +183,7 @@ class FrameworkRouter:
 
     def get_supported_frameworks(self) -> list[str]:
         """Get list of supported frameworks."""
-        return list(self.specialists.keys())
+        return list(self._factory.keys())
 
 
 # Export singleton instance
@@ -1,15 +1,35 @@
 """Chat Orchestrator - Main agent that routes to specialists."""
 
-import json
-from typing import Dict, Optional
+import asyncio
+import atexit
+import logging
+from typing import AsyncIterator, Dict, Optional
 from langchain_openai import ChatOpenAI
 import mvk_sdk as mvk
+import orjson
 
 from ..utils.config import config
-from ..prompts import INTENT_CLASSIFICATION_PROMPT, RESPONSE_SYNTHESIS_PROMPT
+from ..utils.http import ASYNC_HTTPX, SHARED_HTTPX
+from ..utils.llm_cache import cached_invoke, make_cache_key, normalize_query
+from ..utils.mvk_tracker import tracker
+from ..prompts import (
+    INTENT_CLASSIFICATION_PROMPT_PREFIX,
+    INTENT_CLASSIFICATION_PROMPT_SUFFIX,
+    RESPONSE_SYNTHESIS_PROMPT,
+    BATCHED_ROUTING_PROMPT,
+)
 from .sdk_agent import sdk_agent
 from .framework_router import framework_router
 from .code_generator import code_generator
+from .types import IntentClassification, QueryResult
+
+
+logger = logging.getLogger(__name__)
+
+SYSTEM_MSG_INTENT = {"role": "system", "content": "You are an intent classification expert."}
+SYSTEM_MSG_BATCHED = {"role": "system", "content": "You are a team of MVK SDK, framework and code generation experts."}
+_BASE_MESSAGES_INTENT = [SYSTEM_MSG_INTENT, {"role": "user", "content": None}]
+_BASE_MESSAGES_BATCHED = [SYSTEM_MSG_BATCHED, {"role": "user", "content": None}]
 
 
 class ChatOrchestrator:
@@ -21,22 +41,56 @@ class ChatOrchestrator:
         mvk.instrument(
             agent_id=config.MVK_AGENT_ID,
             api_key=config.MVK_API_KEY,
-            enable_batching=True,
-            batch_size=10,
-            flush_interval_seconds=5
+            enable_batching=config.MVK_BATCHING,
+            batch_size=config.MVK_BATCH_SIZE,
+            flush_interval_seconds=config.MVK_FLUSH_INTERVAL
         )
 
+        # Send the last batch on shutdown instead of dropping it; handlers run in
+        # reverse order, so queued tracker metrics reach MVK before mvk.flush
+        atexit.register(mvk.flush)
+        atexit.register(tracker.flush)
+
         self.llm = ChatOpenAI(
             model=config.LLM_MODEL,
             temperature=config.LLM_TEMPERATURE_INTENT,
-            openai_api_key=config.OPENAI_API_KEY
+            openai_api_key=config.OPENAI_API_KEY,
+            http_client=SHARED_HTTPX
         )
 
+        # Intent comes back as a validated model; batched routing needs a bare JSON object
+        self.intent_llm = self.llm.with_structured_output(IntentClassification)
+        self.json_llm = self.llm.bind(response_format={"type": "json_object"})
+
     @mvk.signal(step_type="AGENT", operation="orchestrate")
     def process_query(self, query: str, conversation_history: Optional[str] = None) -> Dict[str, any]:
         """
         Process user query by routing to appropriate agents.
 
+        Synchronous entry point for callers without a running event loop;
+        the loop's async clients are closed before it finishes.
+
+        Args:
+            query: User's question
+            conversation_history: Optional conversation context
+
+        Returns:
+            Dictionary with answer and metadata
+        """
+        return asyncio.run(self._aprocess_query_and_close(query, conversation_history))
+
+    async def _aprocess_query_and_close(self, query: str, conversation_history: Optional[str] = None) -> Dict[str, any]:
+        """Process a query, then close this loop's async clients (for asyncio.run)."""
+        try:
+            return await self._aprocess_query(query, conversation_history)
+        finally:
+            await sdk_agent.aclose()
+            await ASYNC_HTTPX.aclose()
+
+    async def aprocess_query(self, query: str, conversation_history: Optional[str] = None) -> Dict[str, any]:
+        """
+        Process user query from within a running event loop (e.g. Chainlit).
+
         Args:
             query: User's question
             conversation_history: Optional conversation context
@@ -44,16 +98,85 @@ class ChatOrchestrator:
         Returns:
             Dictionary with answer and metadata
         """
+        with mvk.create_signal(
+            name="agent.chat_orchestrator",
+            step_type="AGENT",
+            operation="orchestrate"
+        ):
+            return await self._aprocess_query(query, conversation_history)
+
+    async def aprocess_query_stream(
+        self,
+        query: str,
+        conversation_history: Optional[str] = None
+    ) -> AsyncIterator[str]:
+        """
+        Process user query, yielding the response as each agent finishes.
+
+        Args:
+            query: User's question
+            conversation_history: Optional conversation context
+
+        Yields:
+            Response fragments in display order
+        """
+        tasks = {}
+        batched_responses = None
+        sdk_only = False
+        try:
+            # Identify this agent (contexts are not held across yields)
+            with mvk.context(agent_name="orchestrator"):
+                # Stage 1: Intent classification
+                with mvk.context(name="stage.intent_classification"):
+                    intent = await asyncio.to_thread(self._classify_intent, query)
+
+                # Stage 2: Agent routing
+                with mvk.context(name="stage.agent_routing"):
+                    agent_count = self._count_agents(intent)
+                    if config.ENABLE_BATCHED_ROUTING and agent_count > 1:
+                        batched_responses = await self._batched_multi_agent(query, intent)
+                    elif agent_count == 1 and intent.get("needs_sdk", False):
+                        sdk_only = True
+                    else:
+                        tasks = self._start_agents(query, intent)
+
+            # SDK-only answers stream token by token
+            if sdk_only:
+                async for token in sdk_agent.astream(query):
+                    yield token
+                return
+
+            if batched_responses is not None:
+                yield self._synthesize_response(query, batched_responses, intent)
+                return
+
+            # Stage 3: Response synthesis, one section per finished agent
+            async for chunk in self._synthesize_stream(query, tasks, intent):
+                yield chunk
+
+        except Exception as e:
+            logger.exception("❌ Orchestrator error")
+            yield f"❌ An error occurred: {str(e)}\n\nPlease try rephrasing your question."
+
+        finally:
+            for task in tasks.values():
+                task.cancel()
+
+    async def _aprocess_query(self, query: str, conversation_history: Optional[str] = None) -> Dict[str, any]:
+        """Run intent classification, agent routing and synthesis."""
         # Identify this agent
         with mvk.context(agent_name="orchestrator"):
             try:
                 # Stage 1: Intent classification
                 with mvk.context(name="stage.intent_classification"):
-                    intent = self._classify_intent(query)
+                    intent = await asyncio.to_thread(self._classify_intent, query)
 
                 # Stage 2: Agent routing
                 with mvk.context(name="stage.agent_routing"):
-                    agent_responses = self._route_to_agents(query, intent)
+                    if config.ENABLE_BATCHED_ROUTING and self._count_agents(intent) > 1:
+                        agent_responses = await self._batched_multi_agent(query, intent)
+                    else:
+                        agent_responses = await self._route_to_agents(query, intent)
 
                 # Stage 3: Response synthesis
                 with mvk.context(name="stage.response_synthesis"):
@@ -67,7 +190,7 @@ class ChatOrchestrator:
                 }
 
             except Exception as e:
-                print(f"❌ Orchestrator error: {e}")
+                logger.exception("❌ Orchestrator error")
 
                 return {
                     "answer": f"❌ An error occurred: {str(e)}\n\nPlease try rephrasing your question.",
@@ -87,79 +210,293 @@ class ChatOrchestrator:
             Intent classification dictionary
         """
         try:
-            prompt = INTENT_CLASSIFICATION_PROMPT.format(query=query)
-
-            # LLM call is auto-tracked by MVK SDK
-            response = self.llm.invoke([
-                {"role": "system", "content": "You are an intent classification expert."},
-                {"role": "user", "content": prompt}
-            ])
-
-            # Parse JSON response
-            intent_json = response.content.strip()
-
-            # Remove markdown code blocks if present
-            if "```json" in intent_json:
-                intent_json = intent_json.split("```json")[1].split("```")[0].strip()
-            elif "```" in intent_json:
-                intent_json = intent_json.split("```")[1].split("```")[0].strip()
-
-            intent = json.loads(intent_json)
+            cache_key = make_cache_key(
+                "intent",
+                normalize_query(query),
+                temperature=config.LLM_TEMPERATURE_INTENT
+            )
 
-            return intent
+            return cached_invoke(
+                cache_key,
+                lambda: self._invoke_intent_llm(query),
+                temperature=config.LLM_TEMPERATURE_INTENT
+            )
 
         except Exception as e:
-            print(f"⚠️  Intent classification error: {e}, defaulting to SDK query")
+            logger.warning("⚠️  Intent classification error: %s, defaulting to SDK query", e)
             # Default to SDK query if classification fails
             return {
                 "needs_sdk": True,
                 "needs_framework": False,
                 "needs_code": False,
-                "framework_name": None
+                "framework_name": "generic"
             }
 
-    def _route_to_agents(self, query: str, intent: Dict[str, any]) -> Dict[str, any]:
+    def _invoke_intent_llm(self, query: str) -> Dict[str, any]:
+        """Call the LLM for a structured intent classification."""
+        # Only the short dynamic suffix is formatted
+        prompt = "".join((
+            INTENT_CLASSIFICATION_PROMPT_PREFIX,
+            INTENT_CLASSIFICATION_PROMPT_SUFFIX.format(query=query)
+        ))
+
+        messages = _BASE_MESSAGES_INTENT.copy()
+        messages[1] = {"role": "user", "content": prompt}
+
+        # LLM call is auto-tracked by MVK SDK
+        intent = self.intent_llm.invoke(messages)
+
+        return intent.model_dump()
+
+    async def _route_to_agents(
+        self,
+        query: str,
+        intent: Dict[str, any],
+        answered: Optional[Dict[str, any]] = None
+    ) -> Dict[str, any]:
         """
         Route query to appropriate specialist agents based on intent.
 
+        SDK and framework lookups are independent, so they run concurrently
+        (the framework lookup in a worker thread); code generation waits
+        for both since it uses their answers as context.
+
         Args:
             query: User's question
             intent: Intent classification
+            answered: Responses already produced, reused instead of re-querying those agents
 
         Returns:
             Dictionary of agent responses
         """
-        responses = {}
+        tasks = self._start_agents(query, intent, answered)
+        results = await asyncio.gather(*tasks.values())
+
+        return dict(zip(tasks.keys(), results))
+
+    def _start_agents(
+        self,
+        query: str,
+        intent: Dict[str, any],
+        answered: Optional[Dict[str, any]] = None
+    ) -> Dict[str, asyncio.Future]:
+        """
+        Schedule the specialist agents requested by the intent.
+
+        Args:
+            query: User's question
+            intent: Intent classification
+            answered: Responses already produced, reused instead of re-querying those agents
+
+        Returns:
+            Dictionary of agent name to running task (or already resolved future)
+        """
+        tasks = {}
+
+        # Already-answered agents resolve immediately (code generation can still use them)
+        loop = asyncio.get_running_loop()
+        for agent_name, response in (answered or {}).items():
+            tasks[agent_name] = loop.create_future()
+            tasks[agent_name].set_result(response)
 
         # Query SDK Agent if needed
-        if intent.get("needs_sdk", False):
-            # Agent is already instrumented with @mvk.signal()
-            sdk_response = sdk_agent.query(query)
-            responses["sdk"] = sdk_response
+        if intent.get("needs_sdk", False) and "sdk" not in tasks:
+            # Native async path; aquery opens its own MVK signal
+            tasks["sdk"] = asyncio.create_task(sdk_agent.aquery(query))
 
         # Query Framework Specialist if needed
-        if intent.get("needs_framework", False):
+        if intent.get("needs_framework", False) and "framework" not in tasks:
             framework_name = intent.get("framework_name")
             # Agent is already instrumented with @mvk.signal()
-            framework_response = framework_router.query(query, framework_name)
-            responses["framework"] = framework_response
+            tasks["framework"] = asyncio.create_task(
+                asyncio.to_thread(framework_router.query, query, framework_name)
+            )
+
+        # Query Code Generator if needed (waits for the agents above)
+        if intent.get("needs_code", False) and "code" not in tasks:
+            tasks["code"] = asyncio.create_task(
+                self._generate_code(query, tasks.get("sdk"), tasks.get("framework"))
+            )
+
+        return tasks
+
+    async def _generate_code(
+        self,
+        query: str,
+        sdk_task: Optional[asyncio.Future],
+        framework_task: Optional[asyncio.Future]
+    ) -> Dict[str, any]:
+        """Run the code generator once the SDK and framework answers are available."""
+        # Prepare context from previous agents
+        sdk_context = (await sdk_task).answer if sdk_task else ""
+        framework_context = (await framework_task).get("answer", "") if framework_task else ""
+
+        # Agent is already instrumented with @mvk.signal()
+        return await asyncio.to_thread(
+            code_generator.generate,
+            user_query=query,
+            sdk_context=sdk_context if sdk_context else None,
+            framework_context=framework_context if framework_context else None
+        )
+
+    def _count_agents(self, intent: Dict[str, any]) -> int:
+        """Count how many specialist agents an intent requests."""
+        return sum(bool(intent.get(key)) for key in ("needs_sdk", "needs_framework", "needs_code"))
+
+    async def _batched_multi_agent(self, query: str, intent: Dict[str, any]) -> Dict[str, any]:
+        """
+        Answer every requested agent section with a single LLM call.
+
+        SDK answers still need retrieved documentation; when none can be
+        retrieved the SDK agent is queried on its own instead. Framework
+        answers come from the model without Tavily search, so they carry
+        no sources. If the batched call fails or returns an unexpected
+        shape, the remaining agents are routed individually.
+
+        Args:
+            query: User's question
+            intent: Intent classification
+
+        Returns:
+            Dictionary of agent responses (same shape as _route_to_agents)
+        """
+        responses = {}
+        sections = []
+        sdk_context, sdk_sources = "", []
+        framework_name = intent.get("framework_name") or "generic"
+
+        if intent.get("needs_sdk", False):
+            sdk_context, sdk_sources = await asyncio.to_thread(sdk_agent.retrieve_context, query)
+            if sdk_context:
+                sections.append("[SDK]")
+            else:
+                # No vector context to put in the prompt - use the SDK agent directly
+                responses["sdk"] = await sdk_agent.aquery(query)
+
+        if intent.get("needs_framework", False):
+            sections.append(f"[FRAMEWORK:{framework_name}]")
 
-        # Query Code Generator if needed
         if intent.get("needs_code", False):
-            # Prepare context from previous agents
-            sdk_context = responses.get("sdk", {}).get("answer", "")
-            framework_context = responses.get("framework", {}).get("answer", "")
+            sections.append("[CODE]")
 
-            # Agent is already instrumented with @mvk.signal()
-            code_response = code_generator.generate(
-                user_query=query,
-                sdk_context=sdk_context if sdk_context else None,
-                framework_context=framework_context if framework_context else None
-            )
-            responses["code"] = code_response
+        if not sections:
+            return responses
+
+        prompt = BATCHED_ROUTING_PROMPT.format(
+            sections=", ".join(sections),
+            sdk_context=sdk_context or "Not requested.",
+            query=query
+        )
+
+        messages = _BASE_MESSAGES_BATCHED.copy()
+        messages[1] = {"role": "user", "content": prompt}
+
+        try:
+            # LLM call is auto-tracked by MVK SDK
+            response = await asyncio.to_thread(self.json_llm.invoke, messages)
+
+            batched = self._parse_batched(response.content)
+
+        except Exception as e:
+            logger.warning("⚠️  Batched routing error: %s, falling back to per-agent routing", e)
+            # Agents that already answered are reused, not queried again
+            return await self._route_to_agents(query, intent, answered=responses)
+
+        if "[SDK]" in sections:
+            responses["sdk"] = QueryResult(batched.get("sdk_answer") or "", sdk_sources, True)
+
+        if intent.get("needs_framework", False):
+            responses["framework"] = {
+                "answer": batched.get("framework_answer") or "",
+                "sources": [],
+                "framework": framework_name,
+                "success": True
+            }
+
+        if intent.get("needs_code", False):
+            code = batched.get("code") or {}
+            responses["code"] = {
+                "code": code.get("code") or "",
+                "explanation": code.get("explanation") or "",
+                "cost_estimate": code.get("cost_estimate") or "",
+                "gotchas": code.get("gotchas") or "",
+                "success": True
+            }
 
         return responses
 
+    def _parse_batched(self, content: str) -> Dict[str, any]:
+        """
+        Parse and shape-check the batched routing JSON.
+
+        Raises:
+            ValueError: If the JSON is not the object described in the prompt
+        """
+        batched = orjson.loads(content)
+        if not isinstance(batched, dict):
+            raise ValueError(f"expected a JSON object, got {type(batched).__name__}")
+
+        for key in ("sdk_answer", "framework_answer"):
+            if not isinstance(batched.get(key) or "", str):
+                raise ValueError(f"{key!r} must be a string or null")
+
+        code = batched.get("code") or {}
+        if not isinstance(code, dict):
+            raise ValueError(f"'code' must be an object or null, got {type(code).__name__}")
+
+        for key in ("code", "explanation", "cost_estimate", "gotchas"):
+            if not isinstance(code.get(key) or "", str):
+                raise ValueError(f"code.{key} must be a string")
+
+        return batched
+
+    async def _synthesize_stream(
+        self,
+        query: str,
+        agent_futures: Dict[str, asyncio.Future],
+        intent: Dict[str, any]
+    ) -> AsyncIterator[str]:
+        """
+        Synthesize the response as agents finish, in completion order.
+
+        Formatting matches _synthesize_response, but each agent's section is
+        yielded as soon as its future resolves instead of after all of them.
+
+        Args:
+            query: User's question
+            agent_futures: Dictionary of agent name to pending result
+            intent: Intent classification
+
+        Yields:
+            Response fragments
+        """
+        if not agent_futures:
+            yield self._synthesize_response(query, {}, intent)
+            return
+
+        # Single agent: return its answer without multi-agent framing
+        if len(agent_futures) == 1:
+            agent_name, future = next(iter(agent_futures.items()))
+            yield self._format_single_response(agent_name, await future)
+            return
+
+        yield "🔄 **Multi-Agent Response:**\n\n"
+
+        agent_responses = {}
+        for finished in asyncio.as_completed(
+            [self._tagged(agent_name, future) for agent_name, future in agent_futures.items()]
+        ):
+            agent_name, response = await finished
+            agent_responses[agent_name] = response
+            yield self._format_agent_section(agent_name, response, intent)
+
+        yield self._add_sources(agent_responses)
+
+    @staticmethod
+    async def _tagged(agent_name: str, future: asyncio.Future):
+        """Await an agent future, returning (agent name, result) for as_completed."""
+        return agent_name, await future
+
     def _synthesize_response(self, query: str, agent_responses: Dict[str, any], intent: Dict[str, any]) -> str:
         """
         Synthesize final response from multiple agent outputs.
@@ -174,81 +511,97 @@ class ChatOrchestrator:
         """
         # If only one agent responded, return its answer directly
         if len(agent_responses) == 1:
-            agent_name = list(agent_responses.keys())[0]
-            response = agent_responses[agent_name]
-
-            if agent_name == "code":
-                return self._format_code_response(response)
-            else:
-                return response.get("answer", "")
+            agent_name, response = next(iter(agent_responses.items()))
+            return self._format_single_response(agent_name, response)
 
         # If multiple agents, synthesize
         if len(agent_responses) > 1:
-            # Build agent responses text
-            responses_text = ""
-
-            if "sdk" in agent_responses:
-                responses_text += f"**SDK Agent Response:**\n{agent_responses['sdk'].get('answer', '')}\n\n"
-
-            if "framework" in agent_responses:
-                framework_name = intent.get("framework_name", "framework")
-                responses_text += f"**{framework_name.capitalize()} Specialist Response:**\n{agent_responses['framework'].get('answer', '')}\n\n"
-
-            if "code" in agent_responses:
-                responses_text += f"**Code Generator Response:**\n{self._format_code_response(agent_responses['code'])}\n\n"
-
             # Use LLM to synthesize (optional - can be disabled for cost saving)
             # For now, just concatenate intelligently
-            final_response = "🔄 **Multi-Agent Response:**\n\n"
-            final_response += responses_text
+            parts: list[str] = ["🔄 **Multi-Agent Response:**\n\n"]
+
+            for agent_name in ("sdk", "framework", "code"):
+                if agent_name in agent_responses:
+                    parts.append(self._format_agent_section(agent_name, agent_responses[agent_name], intent))
 
             # Add sources if available
-            final_response += self._add_sources(agent_responses)
+            parts.append(self._add_sources(agent_responses))
 
-            return final_response
+            return "".join(parts)
 
         # Fallback
         return "I couldn't process your query. Please try rephrasing."
 
+    def _format_single_response(self, agent_name: str, response: Dict[str, any]) -> str:
+        """Format the answer of the only agent that responded."""
+        if agent_name == "sdk":
+            return response.answer
+
+        if agent_name == "code":
+            return self._format_code_response(response)
+
+        return response.get("answer", "")
+
+    def _format_agent_section(self, agent_name: str, response: Dict[str, any], intent: Dict[str, any]) -> str:
+        """Format one agent's answer as a section of a multi-agent response."""
+        if agent_name == "sdk":
+            return f"**SDK Agent Response:**\n{response.answer}\n\n"
+
+        if agent_name == "framework":
+            framework_title = (intent.get("framework_name") or "framework").capitalize()
+            return f"**{framework_title} Specialist Response:**\n{response.get('answer', '')}\n\n"
+
+        return f"**Code Generator Response:**\n{self._format_code_response(response)}\n\n"
+
     def _format_code_response(self, code_response: Dict[str, any]) -> str:
         """Format code generator response."""
-        formatted = ""
+        parts: list[str] = []
 
-        if code_response.get("code"):
-            formatted += "```python\n"
-            formatted += code_response["code"]
-            formatted += "\n```\n\n"
+        code = code_response.get("code")
+        if code:
+            parts.append(f"```python\n{code}\n```\n\n")
 
-        if code_response.get("explanation"):
-            formatted += f"**Explanation:**\n{code_response['explanation']}\n\n"
+        explanation = code_response.get("explanation")
+        if explanation:
+            parts.append(f"**Explanation:**\n{explanation}\n\n")
 
-        if code_response.get("cost_estimate"):
-            formatted += f"**Estimated Cost:**\n{code_response['cost_estimate']}\n\n"
+        cost_estimate = code_response.get("cost_estimate")
+        if cost_estimate:
+            parts.append(f"**Estimated Cost:**\n{cost_estimate}\n\n")
 
-        if code_response.get("gotchas"):
-            formatted += f"**Gotchas:**\n{code_response['gotchas']}\n\n"
+        gotchas = code_response.get("gotchas")
+        if gotchas:
+            parts.append(f"**Gotchas:**\n{gotchas}\n\n")
 
-        return formatted
+        return "".join(parts)
 
     def _add_sources(self, agent_responses: Dict[str, any]) -> str:
         """Add source citations to response."""
-        sources_text = ""
+        parts: list[str] = []
 
         # SDK sources
-        if "sdk" in agent_responses and agent_responses["sdk"].get("sources"):
-            sources_text += "**SDK Documentation Sources:**\n"
-            for i, source in enumerate(agent_responses["sdk"]["sources"][:3], 1):
-                sources_text += f"{i}. Page {source['page']}\n"
-            sources_text += "\n"
+        sdk_response = agent_responses.get("sdk")
+        sdk_sources = sdk_response.sources if sdk_response else None
+        if sdk_sources:
+            parts.append(
+                "**SDK Documentation Sources:**\n"
+                + "\n".join(f"{i}. Page {source['page']}" for i, source in enumerate(sdk_sources[:3], 1))
+                + "\n\n"
+            )
 
         # Framework sources
-        if "framework" in agent_responses and agent_responses["framework"].get("sources"):
-            sources_text += "**Framework Sources:**\n"
-            for i, source in enumerate(agent_responses["framework"]["sources"][:3], 1):
-                sources_text += f"{i}. [{source['title']}]({source['url']})\n"
-            sources_text += "\n"
+        framework_sources = agent_responses.get("framework", {}).get("sources")
+        if framework_sources:
+            parts.append(
+                "**Framework Sources:**\n"
+                + "\n".join(
+                    f"{i}. [{source['title']}]({source['url']})"
+                    for i, source in enumerate(framework_sources[:3], 1)
+                )
+                + "\n\n"
+            )
 
-        return sources_text
+        return "".join(parts)
 
 
 # Export singleton instance
@@ -1,124 +1,334 @@
 """SDK Agent - RAG-based MVK SDK documentation query."""
 
-from typing import Dict, List, Optional
-from langchain.chains import RetrievalQA
+import asyncio
+import logging
+import sys
+from functools import cached_property, partial
+from typing import AsyncIterator, Dict, List, Optional, Tuple
 from langchain_openai import ChatOpenAI
 from langchain.schema import Document
 import mvk_sdk as mvk
-from mvk_sdk import Metric
 
 from ..utils.config import config
+from ..utils.http import ASYNC_HTTPX, SHARED_HTTPX, LoopLocal
+from ..utils.mvk_tracker import tracker
+from ..utils.semantic_cache import LLMSemanticCache
 from ..tools.chromadb_manager import chromadb_manager
-from ..prompts import SDK_AGENT_PROMPT
+from ..prompts import format_sdk_messages
+from .types import QueryResult
+
+
+logger = logging.getLogger(__name__)
+
+# A second copy under another package path would build its own LLM client and answer cache
+# Snapshot the keys: other threads may be importing while this runs
+_duplicates = [name for name in list(sys.modules) if name.endswith(".sdk_agent") and name != __name__]
+if _duplicates:
+    raise ImportError(f"sdk_agent already imported as {_duplicates[0]}; import it through one package path")
+
+NOT_INDEXED_MESSAGE = "⚠️ Documentation not yet indexed. Please wait for indexing to complete."
 
 
 class SDKAgent:
     """Agent for querying MVK SDK documentation using RAG."""
 
-    def __init__(self):
-        """Initialize SDK Agent."""
-        self.llm = ChatOpenAI(
+    # Clients are built on first use so importing the module stays cheap
+
+    @cached_property
+    def llm(self) -> ChatOpenAI:
+        """LLM used for answer synthesis on the sync path."""
+        return ChatOpenAI(
             model=config.LLM_MODEL,
             temperature=config.LLM_TEMPERATURE_SDK,
-            openai_api_key=config.OPENAI_API_KEY
+            openai_api_key=config.OPENAI_API_KEY,
+            http_client=SHARED_HTTPX
         )
 
-        self.vectorstore = chromadb_manager.vectorstore
+    @cached_property
+    def _async_llm(self) -> LoopLocal[ChatOpenAI]:
+        """LLM for the async paths, one per event loop (on that loop's HTTP pool)."""
+        return LoopLocal(lambda: ChatOpenAI(
+            model=config.LLM_MODEL,
+            temperature=config.LLM_TEMPERATURE_SDK,
+            openai_api_key=config.OPENAI_API_KEY,
+            http_client=SHARED_HTTPX,
+            http_async_client=ASYNC_HTTPX.get()
+        ))
+
+    async def aclose(self) -> None:
+        """Drop the running loop's async LLM (its HTTP pool is ASYNC_HTTPX's)."""
+        await self._async_llm.aclose()
+
+    @cached_property
+    def vectorstore(self):
+        """Documentation vector store."""
+        return chromadb_manager.vectorstore
+
+    @cached_property
+    def _search(self):
+        """Vector search pre-bound to the configured top-k."""
+        return partial(self.vectorstore.similarity_search_by_vector, k=config.TOP_K_RESULTS)
+
+    @cached_property
+    def answer_cache(self) -> LLMSemanticCache:
+        """Answers for near-duplicate questions over the same retrieved context."""
+        return LLMSemanticCache(
+            chromadb_manager.get_cache_collection(config.SDK_CACHE_COLLECTION),
+            # Shares the query embedding cache with retrieval
+            chromadb_manager
+        )
 
     @mvk.signal(step_type="AGENT", operation="rag_search")
-    def query(self, question: str) -> Dict[str, any]:
+    def query(self, question: str) -> QueryResult:
         """
         Query MVK SDK documentation.
 
+        Synchronous entry point for callers outside the event loop.
+
         Args:
             question: User's SDK-related question
 
         Returns:
-            Dictionary with answer and sources
+            QueryResult with answer and sources
         """
         # Identify this agent
         with mvk.context(agent_name="sdk_agent"):
             try:
                 # Check if ChromaDB is indexed
                 if not chromadb_manager.is_indexed():
-                    return {
-                        "answer": "⚠️ Documentation not yet indexed. Please wait for indexing to complete.",
-                        "sources": [],
-                        "success": False
-                    }
+                    return QueryResult(NOT_INDEXED_MESSAGE, [], False)
 
                 # Stage 1: Vector retrieval
-                with mvk.context(name="stage.retrieval"):
-                    # ChromaDB search is auto-tracked by MVK SDK
-                    docs = chromadb_manager.search(question, k=config.TOP_K_RESULTS)
-
-                    # Track custom ChromaDB search cost
-                    mvk.add_metered_usage(
-                        Metric(
-                            name="chromadb.search",
-                            value=1,
-                            unit="search",
-                            estimated_cost=config.TOOL_PRICES["chromadb_search"],
-                            metadata={
-                                "vectors_searched": chromadb_manager.get_document_count(),
-                                "results_returned": len(docs) if docs else 0,
-                                "top_k": config.TOP_K_RESULTS
-                            }
-                        )
-                    )
-
-                if not docs:
-                    return {
-                        "answer": "I couldn't find relevant information in the MVK SDK documentation for this question.",
-                        "sources": [],
-                        "success": False
-                    }
-
-                # Build context from retrieved documents
+                docs = self._retrieve(question)
                 context = self._build_context(docs)
 
+                # Reuse a cached answer for a similar question over the same context
+                ctx_hash, question_vector, cached = self._lookup_answer(question, context)
+                if cached is not None:
+                    return cached
+
                 # Stage 2: Answer synthesis
                 with mvk.context(name="stage.synthesis"):
-                    prompt = SDK_AGENT_PROMPT.format(
-                        context=context,
-                        question=question
-                    )
-
                     # LLM call is auto-tracked by MVK SDK
-                    response = self.llm.invoke([
-                        {"role": "system", "content": "You are an MVK SDK expert assistant."},
-                        {"role": "user", "content": prompt}
-                    ])
-
-                    answer = response.content
+                    response = self.llm.invoke(format_sdk_messages(context, question))
 
-                # Extract sources
                 sources = self._extract_sources(docs)
+                self.answer_cache.set(question, question_vector, ctx_hash, response.content, sources)
 
-                return {
-                    "answer": answer,
-                    "sources": sources,
-                    "success": True
-                }
+                return QueryResult(response.content, sources, True)
 
             except Exception as e:
-                print(f"❌ SDK Agent error: {e}")
+                logger.exception("❌ SDK Agent error")
+
+                return QueryResult(f"❌ Error querying SDK documentation: {str(e)}", [], False)
+
+    async def aquery(self, question: str) -> QueryResult:
+        """
+        Query MVK SDK documentation from within a running event loop.
+
+        Blocking retrieval and cache work runs in worker threads and the LLM
+        is called asynchronously, so concurrent sessions are not stalled.
+
+        Args:
+            question: User's SDK-related question
+
+        Returns:
+            QueryResult with answer and sources
+        """
+        with mvk.create_signal(
+            name="agent.sdk_agent",
+            step_type="AGENT",
+            operation="rag_search"
+        ):
+            # Identify this agent
+            with mvk.context(agent_name="sdk_agent"):
+                try:
+                    # Check if ChromaDB is indexed
+                    if not chromadb_manager.is_indexed():
+                        return QueryResult(NOT_INDEXED_MESSAGE, [], False)
+
+                    # Stage 1: Vector retrieval
+                    docs = await asyncio.to_thread(self._retrieve, question)
+                    context = self._build_context(docs)
+
+                    # Reuse a cached answer for a similar question over the same context
+                    ctx_hash, question_vector, cached = await asyncio.to_thread(
+                        self._lookup_answer, question, context
+                    )
+                    if cached is not None:
+                        return cached
+
+                    # Stage 2: Answer synthesis
+                    with mvk.context(name="stage.synthesis"):
+                        # LLM call is auto-tracked by MVK SDK
+                        response = await self._async_llm.get().ainvoke(format_sdk_messages(context, question))
+
+                    sources = self._extract_sources(docs)
+                    await asyncio.to_thread(
+                        self.answer_cache.set, question, question_vector, ctx_hash, response.content, sources
+                    )
+
+                    return QueryResult(response.content, sources, True)
+
+                except Exception as e:
+                    logger.exception("❌ SDK Agent error")
+
+                    return QueryResult(f"❌ Error querying SDK documentation: {str(e)}", [], False)
 
-                return {
-                    "answer": f"❌ Error querying SDK documentation: {str(e)}",
-                    "sources": [],
-                    "success": False
+    def _retrieve(self, question: str) -> List[Document]:
+        """Search the documentation and record the search cost."""
+        top_k = config.TOP_K_RESULTS
+
+        with mvk.context(name="stage.retrieval"):
+            # Embedding is memoized, so the answer cache lookup reuses it
+            # A non-empty collection always returns at least one document
+            docs = self._search(chromadb_manager.embed_query(question))
+
+            # Track custom ChromaDB search cost (reported in the background)
+            tracker.track_operation_with_cost(
+                "chromadb.search",
+                "chromadb_search",
+                unit="search",
+                metadata={
+                    "vectors_searched": chromadb_manager.get_document_count(),
+                    "results_returned": len(docs),
+                    "top_k": top_k
                 }
+            )
+
+        return docs
+
+    def _lookup_answer(
+        self,
+        question: str,
+        context: str
+    ) -> Tuple[str, List[float], Optional[QueryResult]]:
+        """
+        Look up a cached answer for the question over this context.
+
+        Returns:
+            Tuple of (context hash, question embedding, cached result or None)
+        """
+        ctx_hash = self.answer_cache.context_hash(context)
+        question_vector = self.answer_cache.embed(question)
+
+        cached = self.answer_cache.get(question_vector, ctx_hash)
+        if cached is None:
+            return ctx_hash, question_vector, None
+
+        tracker.track_metric_nowait(
+            "sdk_agent.cache_hits",
+            1,
+            "hit",
+            metadata={"ctx_hash": ctx_hash}
+        )
+
+        return ctx_hash, question_vector, QueryResult(cached["answer"], cached["sources"], True)
+
+    async def astream(self, question: str) -> AsyncIterator[str]:
+        """
+        Answer an SDK question, yielding answer tokens as the LLM produces them.
+
+        The answer is produced by a task running inside the same MVK signal
+        and agent context as aquery, so streamed queries are traced and
+        billed like the others; contexts are never held across this
+        generator's yields.
+
+        Args:
+            question: User's SDK-related question
+
+        Yields:
+            Answer fragments
+        """
+        tokens: asyncio.Queue = asyncio.Queue()
+        producer = asyncio.create_task(self._stream_into(question, tokens))
+
+        try:
+            while (token := await tokens.get()) is not None:
+                yield token
+        finally:
+            # Stop generating if the consumer goes away early
+            producer.cancel()
+
+    async def _stream_into(self, question: str, tokens: asyncio.Queue) -> None:
+        """Stream the answer into a queue, ending it with None."""
+        try:
+            with mvk.create_signal(
+                name="agent.sdk_agent",
+                step_type="AGENT",
+                operation="rag_search"
+            ):
+                # Identify this agent
+                with mvk.context(agent_name="sdk_agent"):
+                    async for token in self._stream_answer(question):
+                        tokens.put_nowait(token)
+        finally:
+            tokens.put_nowait(None)
+
+    async def _stream_answer(self, question: str) -> AsyncIterator[str]:
+        """Retrieve, check the answer cache and stream the LLM answer."""
+        try:
+            # Check if ChromaDB is indexed
+            if not chromadb_manager.is_indexed():
+                yield NOT_INDEXED_MESSAGE
+                return
+
+            # Stage 1: Vector retrieval (same tracked path as query/aquery)
+            docs = await asyncio.to_thread(self._retrieve, question)
+            if not docs:
+                yield "I couldn't find relevant information in the MVK SDK documentation for this question."
+                return
+
+            context = self._build_context(docs)
+
+            ctx_hash, question_vector, cached = await asyncio.to_thread(self._lookup_answer, question, context)
+            if cached is not None:
+                yield cached.answer
+                return
+
+            # Stage 2: Answer synthesis (streamed LLM call is auto-tracked by MVK SDK)
+            tokens = []
+            async for chunk in self._async_llm.get().astream(format_sdk_messages(context, question)):
+                if chunk.content:
+                    tokens.append(chunk.content)
+                    yield chunk.content
+
+            await asyncio.to_thread(
+                self.answer_cache.set,
+                question, question_vector, ctx_hash, "".join(tokens), self._extract_sources(docs)
+            )
+
+        except Exception as e:
+            logger.exception("❌ SDK Agent error")
+            yield f"❌ Error querying SDK documentation: {str(e)}"
+
+    def retrieve_context(self, question: str) -> Tuple[str, List[Dict[str, any]]]:
+        """
+        Retrieve documentation context without generating an answer.
+
+        Args:
+            question: User's SDK-related question
+
+        Returns:
+            Tuple of (context string, sources); empty if nothing was retrieved
+        """
+        if not chromadb_manager.is_indexed():
+            return "", []
+
+        docs = self._retrieve(question)
+        if not docs:
+            return "", []
+
+        return self._build_context(docs), self._extract_sources(docs)
 
     def _build_context(self, docs: List[Document]) -> str:
         """Build context string from retrieved documents."""
-        context = ""
-        for i, doc in enumerate(docs, 1):
-            page = doc.metadata.get("page", "?")
-            content = doc.page_content.strip()
-            context += f"[Source {i} - Page {page}]\n{content}\n\n"
+        parts = [
+            f"[Source {i} - Page {doc.metadata.get('page', '?')}]\n{doc.page_content.strip()}"
+            for i, doc in enumerate(docs, 1)
+        ]
 
-        return context
+        return "\n\n".join(parts) + "\n\n"
 
     def _extract_sources(self, docs: List[Document]) -> List[Dict[str, any]]:
         """Extract source information from documents."""
@@ -126,7 +336,8 @@ class SDKAgent:
         for doc in docs:
             sources.append({
                 "page": doc.metadata.get("page", "Unknown"),
-                "source": doc.metadata.get("source", "mvk_sdk_documentation.pdf")
+                "source": doc.metadata.get("source", "mvk_sdk_documentation.pdf"),
+                "preview": doc.metadata.get("preview", "")
             })
 
         return sources
@@ -0,0 +1,37 @@
+"""Typed payloads exchanged between agents."""
+
+from typing import Any, Dict, List, Literal, NamedTuple
+from pydantic import BaseModel, Field
+
+
+# Frameworks with a dedicated specialist ("generic" covers everything else)
+FrameworkName = Literal["langchain", "llamaindex", "crewai", "autogen", "haystack", "generic"]
+
+
+class IntentClassification(BaseModel):
+    """Which specialist agents a user query needs."""
+
+    needs_sdk: bool = Field(description="The query asks about the MVK SDK (mvk, sdk, instrumentation, signal, tracking, context)")
+    needs_framework: bool = Field(description="The query asks about a specific AI framework")
+    needs_code: bool = Field(description="The user wants a code example (show, example, code, how to, implement)")
+    framework_name: FrameworkName = Field(
+        default="generic",
+        description="Framework mentioned; generic when it is another framework or none"
+    )
+
+
+class CodeResponse(BaseModel):
+    """Generated code example with its supporting notes."""
+
+    code: str = Field(description="Complete, working Python code without markdown fences")
+    explanation: str = Field(description="Brief description of what the code does")
+    cost_estimate: str = Field(description="Approximate cost per execution, e.g. \"$0.002 per query\"")
+    gotchas: str = Field(description="Common pitfalls or important warnings")
+
+
+class QueryResult(NamedTuple):
+    """SDK Agent answer with the documentation pages it was built from."""
+
+    answer: str
+    sources: List[Dict[str, Any]]
+    success: bool
@@ -2,10 +2,15 @@
 
 import chainlit as cl
 from chainlit.input_widget import TextInput
+import asyncio
+import logging
 import time
+import uuid
 import mvk_sdk as mvk
 
 from utils.config import config
+from utils.logging import setup_logging
+from utils.mvk_tracker import tracker
 from utils.session_manager import session_manager
 from agents.orchestrator import chat_orchestrator
 from prompts import (
@@ -18,6 +23,9 @@ from prompts import (
 )
 
 
+setup_logging()
+logger = logging.getLogger(__name__)
+
 # Authentication state
 AUTH_STATE_USERNAME = "awaiting_username"
 AUTH_STATE_PASSWORD = "awaiting_password"
@@ -132,10 +140,11 @@ async def handle_query(query: str):
     session_id = cl.user_session.get("session_id")
 
     # Create conversation ID for this query
-    conversation_id = f"conv-{int(time.time() * 1000)}"
+    conversation_id = f"conv-{uuid.uuid4().hex[:16]}"
 
-    # Show loading message
-    loading_msg = await cl.Message(content="🔍 Processing your query...").send()
+    # Answer message is filled in as the response streams
+    msg = cl.Message(content="")
+    await msg.send()
 
     try:
         # Track query with MVK SDK context
@@ -148,20 +157,25 @@ async def handle_query(query: str):
             tenant_id=config.MVK_TENANT_ID
         ):
             with mvk.context(conversation_id=conversation_id):
-                # Process query through orchestrator
-                result = chat_orchestrator.process_query(query)
+                # The stream yields outside MVK contexts, so the orchestrator signal is opened here
+                with mvk.create_signal(
+                    name="agent.chat_orchestrator",
+                    step_type="AGENT",
+                    operation="orchestrate"
+                ):
+                    async for chunk in chat_orchestrator.aprocess_query_stream(query):
+                        await msg.stream_token(chunk)
 
         # Calculate latency
         latency_ms = (time.time() - start_time) * 1000
 
-        # Update loading message with result
-        await loading_msg.update(content=result["answer"])
+        await msg.update()
 
         # Store conversation in session
         session_manager.add_conversation(
             session_id=session_id,
             user_message=query,
-            assistant_message=result["answer"],
+            assistant_message=msg.content,
             conversation_id=conversation_id
         )
 
@@ -181,7 +195,7 @@ async def handle_query(query: str):
 
     except Exception as e:
         error_msg = ERROR_GENERAL.format(error=str(e))
-        await loading_msg.update(content=error_msg)
+        await msg.update(content=error_msg)
 
 
 @cl.action_callback("feedback_helpful")
@@ -221,7 +235,10 @@ async def end():
     if session_id:
         user_session = session_manager.get_session(session_id)
         if user_session:
-            print(f"📊 Session ended: {user_session.to_dict()}")
+            logger.info("📊 Session ended: %s", user_session.to_dict())
+
+    # Report metrics still queued for this session
+    await asyncio.to_thread(tracker.flush)
 
 
 if __name__ == "__main__":
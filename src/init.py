@@ -4,6 +4,8 @@ import os
 import sys
 
 from utils.config import config
+from utils.logging import setup_logging
+from utils.mvk_tracker import tracker
 from tools.pdf_ingestion import pdf_ingestor
 from tools.chromadb_manager import chromadb_manager
 
@@ -48,16 +50,13 @@ def index_pdf_if_needed() -> bool:
     print("📄 ChromaDB not indexed. Starting PDF ingestion...")
 
     try:
-        # Ingest PDF
-        chunks = pdf_ingestor.ingest()
+        # Ingest PDF and index chunks as they are produced
+        indexed = chromadb_manager.index_documents(pdf_ingestor.iter_chunks())
 
-        if not chunks:
+        if not indexed:
             print("❌ No chunks created from PDF")
             return False
 
-        # Index into ChromaDB
-        chromadb_manager.index_documents(chunks)
-
         doc_count = chromadb_manager.get_document_count()
         print(f"✅ Successfully indexed {doc_count} documents")
 
@@ -87,6 +86,8 @@ def print_stats():
 
 def main():
     """Main initialization function."""
+    setup_logging()
+
     print("=" * 60)
     print("Mavvrik SDK Assistant - Initialization")
     print("=" * 60)
@@ -103,6 +104,9 @@ def main():
         print("Please ensure mvk_sdk_documentation.pdf is in the docs/ directory.")
         sys.exit(1)
 
+    # Report queued ingestion and indexing metrics before the script exits
+    tracker.flush()
+
     # Print stats
     print_stats()
 
@@ -1,10 +1,15 @@
 """Prompts package."""
 
 from .prompts import (
-    INTENT_CLASSIFICATION_PROMPT,
-    SDK_AGENT_PROMPT,
-    FRAMEWORK_SPECIALIST_PROMPT,
-    CODE_GENERATOR_PROMPT,
+    INTENT_CLASSIFICATION_PROMPT_PREFIX,
+    INTENT_CLASSIFICATION_PROMPT_SUFFIX,
+    SDK_AGENT_SYSTEM_PROMPT,
+    format_sdk_messages,
+    FRAMEWORK_SPECIALIST_PROMPT_PREFIX,
+    FRAMEWORK_SPECIALIST_PROMPT_SUFFIX,
+    CODE_GENERATOR_PROMPT_PREFIX,
+    CODE_GENERATOR_PROMPT_SUFFIX,
+    BATCHED_ROUTING_PROMPT,
     RESPONSE_SYNTHESIS_PROMPT,
     WELCOME_MESSAGE,
     AUTH_USERNAME_PROMPT,
@@ -19,10 +24,15 @@ from .prompts import (
 )
 
 __all__ = [
-    "INTENT_CLASSIFICATION_PROMPT",
-    "SDK_AGENT_PROMPT",
-    "FRAMEWORK_SPECIALIST_PROMPT",
-    "CODE_GENERATOR_PROMPT",
+    "INTENT_CLASSIFICATION_PROMPT_PREFIX",
+    "INTENT_CLASSIFICATION_PROMPT_SUFFIX",
+    "SDK_AGENT_SYSTEM_PROMPT",
+    "format_sdk_messages",
+    "FRAMEWORK_SPECIALIST_PROMPT_PREFIX",
+    "FRAMEWORK_SPECIALIST_PROMPT_SUFFIX",
+    "CODE_GENERATOR_PROMPT_PREFIX",
+    "CODE_GENERATOR_PROMPT_SUFFIX",
+    "BATCHED_ROUTING_PROMPT",
     "RESPONSE_SYNTHESIS_PROMPT",
     "WELCOME_MESSAGE",
     "AUTH_USERNAME_PROMPT",
@@ -1,53 +1,55 @@
 """LLM prompts for all agents."""
 
-# Intent Classification Prompt
-INTENT_CLASSIFICATION_PROMPT = """Analyze this user query and classify what they need.
+# Prompts used on every request are split into a static PREFIX, which is
+# never formatted and forms a stable cacheable prompt prefix, and a short
+# SUFFIX holding the {placeholders}. Build with "".join((PREFIX, SUFFIX.format(...))).
 
-User Query: {query}
+# Intent Classification Prompt
+INTENT_CLASSIFICATION_PROMPT_PREFIX = """Analyze the user query below and classify what they need.
 
 Classify into these categories:
 1. needs_sdk: Does the query ask about MVK SDK? (keywords: mvk, sdk, instrumentation, signal, tracking, @mvk, context)
 2. needs_framework: Does the query ask about a specific framework? (langchain, llamaindex, crewai, autogen, haystack, etc.)
 3. needs_code: Does the user want a code example? (keywords: "show", "example", "code", "how to", "implement")
-4. framework_name: If framework mentioned, extract exact name (langchain, llamaindex, crewai, autogen, haystack, generic)
+4. framework_name: Exact name of the framework mentioned (langchain, llamaindex, crewai, autogen, haystack), or generic for any other framework or none
 
-Return ONLY valid JSON (no markdown, no extra text):
-{{
-    "needs_sdk": true or false,
-    "needs_framework": true or false,
-    "needs_code": true or false,
-    "framework_name": "langchain" | "llamaindex" | "crewai" | "autogen" | "haystack" | "generic" | null
-}}"""
+"""
 
-# SDK Agent Prompt
-SDK_AGENT_PROMPT = """You are an expert on the MVK SDK (Mavvrik SDK). Your job is to answer questions about the SDK using the provided documentation context.
+INTENT_CLASSIFICATION_PROMPT_SUFFIX = """User Query: {query}"""
 
-Context from MVK SDK documentation:
-{context}
-
-User Question: {question}
+# SDK Agent Prompt (static system message; documentation and question follow as user messages)
+SDK_AGENT_SYSTEM_PROMPT = """You are an expert on the MVK SDK (Mavvrik SDK). Your job is to answer questions about the SDK using the provided documentation context.
 
 Instructions:
-1. Answer the question using ONLY the provided context
+1. Answer the question using ONLY the provided documentation
 2. Be concise and precise
 3. Include code examples if relevant
 4. Mention related functions or concepts if helpful
-5. If the context doesn't contain the answer, say "I don't have that information in the documentation"
+5. If the documentation doesn't contain the answer, say "I don't have that information in the documentation"
 
 Format your response clearly with:
 - Brief explanation
 - Code example (if applicable)
-- Important notes or gotchas (if applicable)
+- Important notes or gotchas (if applicable)"""
 
-Answer:"""
 
-# Framework Specialist Prompt
-FRAMEWORK_SPECIALIST_PROMPT = """You are a {framework_name} expert. Answer the user's question using the web search results provided.
+def format_sdk_messages(context: str, question: str) -> list[dict]:
+    """
+    Build SDK Agent messages ordered from most to least stable.
 
-Web Search Results:
-{search_results}
+    The system prompt never changes, the documentation repeats for similar
+    questions, and the question comes last, so repeated requests share the
+    longest possible cached prefix.
+    """
+    return [
+        {"role": "system", "content": SDK_AGENT_SYSTEM_PROMPT},
+        {"role": "user", "content": f"Documentation:\n{context}"},
+        {"role": "user", "content": f"Question: {question}"},
+    ]
 
-User Question: {question}
+
+# Framework Specialist Prompt
+FRAMEWORK_SPECIALIST_PROMPT_PREFIX = """Answer the user's question about the framework named below using the web search results provided.
 
 Instructions:
 1. Synthesize information from the search results
@@ -56,18 +58,19 @@ Instructions:
 4. Cite sources with URLs
 5. Be concise but comprehensive
 
-Answer:"""
+"""
 
-# Code Generator Prompt
-CODE_GENERATOR_PROMPT = """You are an expert code generator specializing in MVK SDK integration with AI frameworks.
+FRAMEWORK_SPECIALIST_PROMPT_SUFFIX = """Framework: {framework_name}
 
-User Requirements: {user_query}
+Web Search Results:
+{search_results}
 
-MVK SDK Context (from documentation):
-{sdk_context}
+User Question: {question}
 
-Framework Context (from web search):
-{framework_context}
+Answer:"""
+
+# Code Generator Prompt
+CODE_GENERATOR_PROMPT_PREFIX = """You are an expert code generator specializing in MVK SDK integration with AI frameworks.
 
 Instructions:
 Generate a complete, working Python code example that:
@@ -79,27 +82,49 @@ Generate a complete, working Python code example that:
 6. Shows proper error handling
 
 Also provide:
-- **Explanation**: Brief description of what the code does
-- **Estimated Cost**: Approximate cost per execution (e.g., "$0.002 per query")
-- **Gotchas**: Common pitfalls or important warnings
+- explanation: Brief description of what the code does
+- cost_estimate: Approximate cost per execution (e.g., "$0.002 per query")
+- gotchas: Common pitfalls or important warnings, each starting with ⚠️
 
-Format your response as:
+"""
 
-```python
-# Your complete working code here
-```
-
-**Explanation:**
-[Your explanation here]
+CODE_GENERATOR_PROMPT_SUFFIX = """MVK SDK Context (from documentation):
+{sdk_context}
 
-**Estimated Cost:**
-[Cost estimate here]
+Framework Context (from web search):
+{framework_context}
 
-**Gotchas:**
-⚠️ [Important warnings here]
+User Requirements: {user_query}
 
 Generate the code:"""
 
+# Batched Routing Prompt (one call answering several agent sections)
+BATCHED_ROUTING_PROMPT = """You are answering a developer question on behalf of several specialist agents at once.
+
+Return ONLY valid JSON (no markdown, no extra text):
+{{
+    "sdk_answer": string or null,
+    "framework_answer": string or null,
+    "code": {{
+        "code": string,
+        "explanation": string,
+        "cost_estimate": string,
+        "gotchas": string
+    }} or null
+}}
+
+Fill ONLY the sections listed under "Sections requested" and set the others to null:
+- [SDK] -> "sdk_answer": Answer using ONLY the MVK SDK documentation context. If the context doesn't contain the answer, say "I don't have that information in the documentation".
+- [FRAMEWORK:<name>] -> "framework_answer": Accurate, framework-specific guidance for <name>, with code examples when relevant.
+- [CODE] -> "code": A complete, working Python example that imports MVK SDK, calls mvk.instrument before provider imports, uses MVK context tracking (user_id, session_id, tenant_id), and includes inline comments and error handling. Put the raw code (no markdown fences) in "code", plus a brief explanation, an approximate cost per execution, and common pitfalls in "gotchas".
+
+Sections requested: {sections}
+
+MVK SDK Documentation Context:
+{sdk_context}
+
+User Question: {query}"""
+
 # Response Synthesis Prompt
 RESPONSE_SYNTHESIS_PROMPT = """You are synthesizing responses from multiple specialized agents into a single, coherent answer for the user.
 
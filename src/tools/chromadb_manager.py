@@ -1,14 +1,87 @@
 """ChromaDB vector store management."""
 
+import asyncio
+import functools
+import itertools
+import logging
 import os
-from typing import List, Optional
-from langchain_community.vectorstores import Chroma
+import sys
+from typing import Callable, Iterable, List, Optional, Tuple
+from uuid import uuid4
+import chromadb
 from langchain_openai import OpenAIEmbeddings
 from langchain.schema import Document
-import mvk_sdk as mvk
-from mvk_sdk import Metric
+from openai import AsyncOpenAI
+from tqdm import tqdm
 
 from ..utils.config import config
+from ..utils.http import SHARED_HTTPX
+from ..utils.mvk_tracker import tracker
+
+
+logger = logging.getLogger(__name__)
+
+# Importing this module under two package paths (e.g. tools.* and src.tools.*)
+# would open the collection and load its HNSW index into memory twice
+# Snapshot the keys: other threads may be importing while this runs
+_duplicates = [name for name in list(sys.modules) if name.endswith(".chromadb_manager") and name != __name__]
+if _duplicates:
+    raise ImportError(f"chromadb_manager already imported as {_duplicates[0]}; import it through one package path")
+
+# HNSW index parameters (only applied when the collection is first created)
+HNSW_METADATA = {
+    "hnsw:space": "cosine",
+    "hnsw:M": 32,
+    "hnsw:construction_ef": 200,
+    "hnsw:search_ef": 64,
+    "hnsw:num_threads": os.cpu_count() or 1,
+}
+
+
+class ChromaVectorStore:
+    """Minimal vector store over a raw Chroma collection."""
+
+    def __init__(self, client: chromadb.ClientAPI, collection, embed_query: Callable[[str], List[float]]):
+        """
+        Initialize vector store.
+
+        Args:
+            client: Persistent Chroma client owning the collection
+            collection: Chroma collection holding the documents
+            embed_query: Function embedding a query string
+        """
+        self._client = client
+        self._collection = collection
+        self.embed_query = embed_query
+
+    def similarity_search(self, query: str, k: int) -> List[Document]:
+        """Return the k documents closest to the query."""
+        return [doc for doc, _ in self.similarity_search_with_score(query, k)]
+
+    def similarity_search_by_vector(self, embedding: List[float], k: int) -> List[Document]:
+        """Return the k documents closest to an already embedded query."""
+        return [doc for doc, _ in self._query(embedding, k)]
+
+    def similarity_search_with_score(self, query: str, k: int) -> List[tuple[Document, float]]:
+        """Return the k closest documents with their distances."""
+        return self._query(self.embed_query(query), k)
+
+    def _query(self, embedding: List[float], k: int) -> List[tuple[Document, float]]:
+        """Query the collection and convert hits to (Document, distance) pairs."""
+        results = self._collection.query(
+            query_embeddings=[embedding],
+            n_results=k,
+            include=["documents", "metadatas", "distances"]
+        )
+
+        return [
+            (Document(page_content=text, metadata=metadata or {}), distance)
+            for text, metadata, distance in zip(
+                results["documents"][0],
+                results["metadatas"][0],
+                results["distances"][0]
+            )
+        ]
 
 
 class ChromaDBManager:
@@ -19,11 +92,8 @@ class ChromaDBManager:
         self.collection_name = config.CHROMA_COLLECTION
         self.persist_directory = config.CHROMA_PERSIST_DIR
 
-        # Initialize OpenAI embeddings
-        self.embeddings = OpenAIEmbeddings(
-            model=config.EMBEDDING_MODEL,
-            openai_api_key=config.OPENAI_API_KEY
-        )
+        # Repeated queries reuse their embedding instead of calling OpenAI again
+        self._q_emb_cache = functools.lru_cache(maxsize=1024)(self._embed_query_raw)
 
         # Create persist directory if it doesn't exist
         os.makedirs(self.persist_directory, exist_ok=True)
@@ -31,73 +101,182 @@ class ChromaDBManager:
         # Load or initialize vector store
         self._vectorstore = None
 
+        # Document count only changes when indexing, so it is cached
+        self._doc_count_cache: Optional[int] = None
+
+        # Once documents are seen they stay indexed for the life of the process
+        self._indexed_flag: Optional[bool] = None
+
+    @functools.cached_property
+    def embeddings(self) -> OpenAIEmbeddings:
+        """OpenAI embeddings client (created on first use)."""
+        return OpenAIEmbeddings(
+            model=config.EMBEDDING_MODEL,
+            openai_api_key=config.OPENAI_API_KEY,
+            http_client=SHARED_HTTPX
+        )
+
     @property
-    def vectorstore(self) -> Chroma:
+    def vectorstore(self) -> ChromaVectorStore:
         """Get or initialize vector store."""
         if self._vectorstore is None:
-            # Try to load existing vector store
-            if os.path.exists(os.path.join(self.persist_directory, "chroma.sqlite3")):
-                print(f"📂 Loading existing ChromaDB from {self.persist_directory}...")
-                self._vectorstore = Chroma(
-                    collection_name=self.collection_name,
-                    embedding_function=self.embeddings,
-                    persist_directory=self.persist_directory
-                )
-                count = self._vectorstore._collection.count()
-                print(f"✅ Loaded ChromaDB with {count} documents")
+            exists = os.path.exists(os.path.join(self.persist_directory, "chroma.sqlite3"))
+
+            if exists:
+                logger.info("📂 Loading existing ChromaDB from %s...", self.persist_directory)
             else:
-                # Create empty vector store
-                print(f"🆕 Creating new ChromaDB at {self.persist_directory}...")
-                self._vectorstore = Chroma(
-                    collection_name=self.collection_name,
-                    embedding_function=self.embeddings,
-                    persist_directory=self.persist_directory
-                )
-                print("✅ Created empty ChromaDB")
+                logger.info("🆕 Creating new ChromaDB at %s...", self.persist_directory)
+
+            client = chromadb.PersistentClient(path=self.persist_directory)
+            collection = client.get_or_create_collection(
+                name=self.collection_name,
+                metadata=HNSW_METADATA
+            )
+            self._vectorstore = ChromaVectorStore(client, collection, self.embed_query)
+
+            if exists:
+                logger.info("✅ Loaded ChromaDB with %d documents", collection.count())
+            else:
+                logger.info("✅ Created empty ChromaDB")
 
         return self._vectorstore
 
-    def index_documents(self, documents: List[Document]) -> None:
+    def _embed_query_raw(self, query: str) -> Tuple[float, ...]:
+        """Embed a query as an immutable (cacheable) vector."""
+        return tuple(self.embeddings.embed_query(query))
+
+    def embed_query(self, query: str) -> List[float]:
         """
-        Index documents into ChromaDB.
+        Embed a query, reusing the vector for previously seen text.
 
         Args:
-            documents: List of Document chunks to index
+            query: Query text
+
+        Returns:
+            Embedding vector
         """
-        if not documents:
-            print("⚠️  No documents to index")
-            return
-
-        print(f"🔄 Indexing {len(documents)} documents into ChromaDB...")
-
-        # Create embeddings and store (auto-tracked by MVK SDK)
-        self._vectorstore = Chroma.from_documents(
-            documents=documents,
-            embedding=self.embeddings,
-            collection_name=self.collection_name,
-            persist_directory=self.persist_directory
+        return list(self._q_emb_cache(query))
+
+    def get_cache_collection(self, name: str):
+        """
+        Get or create an auxiliary collection next to the documentation.
+
+        Args:
+            name: Collection name
+
+        Returns:
+            Raw Chroma collection using cosine distance
+        """
+        return self.vectorstore._client.get_or_create_collection(
+            name=name,
+            metadata={"hnsw:space": "cosine"}
         )
 
-        # Persist to disk
-        self._vectorstore.persist()
+    def index_documents(self, documents: Iterable[Document]) -> int:
+        """
+        Index documents into ChromaDB.
+
+        Synchronous wrapper for callers without a running event loop.
+
+        Args:
+            documents: Document chunks to index (a list or a generator)
+
+        Returns:
+            Number of documents indexed
+        """
+        return asyncio.run(self.index_documents_async(documents))
+
+    async def index_documents_async(self, documents: Iterable[Document]) -> int:
+        """
+        Index documents into ChromaDB, embedding batches concurrently.
+
+        Batches are pulled from the iterable in a worker thread (a chunk
+        generator parses the PDF as it goes), so the event loop stays free
+        and embedding requests already in flight progress while later
+        chunks are still being produced. If any embedding or insert fails,
+        the outstanding embedding requests are cancelled.
+
+        Args:
+            documents: Document chunks to index (a list or a generator)
 
-        count = self._vectorstore._collection.count()
+        Returns:
+            Number of documents indexed
+        """
+        collection = self.vectorstore._collection
+        batch_size = config.INDEX_BATCH_SIZE
+        documents = iter(documents)
+
+        # Bounded concurrency keeps embedding requests within OpenAI rate limits
+        semaphore = asyncio.Semaphore(config.INDEX_CONCURRENCY)
+
+        # Client is scoped to this call so its connections belong to the current loop
+        async with AsyncOpenAI(api_key=config.OPENAI_API_KEY) as client:
+
+            async def embed_batch(batch: List[Document]) -> List[List[float]]:
+                async with semaphore:
+                    # Embeddings call is auto-tracked by MVK SDK
+                    response = await client.embeddings.create(
+                        model=config.EMBEDDING_MODEL,
+                        input=[doc.page_content for doc in batch]
+                    )
+                return [item.embedding for item in response.data]
+
+            pending = []
+            try:
+                while batch := await asyncio.to_thread(list, itertools.islice(documents, batch_size)):
+                    # Source previews are computed once here instead of on every query
+                    for doc in batch:
+                        doc.metadata["preview"] = doc.page_content[:150] + "..."
+
+                    pending.append((batch, asyncio.create_task(embed_batch(batch))))
+
+                total = sum(len(batch) for batch, _ in pending)
+                if not total:
+                    logger.warning("⚠️  No documents to index")
+                    return 0
+
+                logger.info("🔄 Indexing %d documents into ChromaDB...", total)
+
+                # Inserts are cheap next to embedding, so they run in order; each one
+                # writes SQLite and HNSW files, so it runs off the event loop
+                with tqdm(total=total, desc="Indexing", unit="doc") as progress:
+                    for batch, task in pending:
+                        await asyncio.to_thread(
+                            collection.add,
+                            ids=[str(uuid4()) for _ in batch],
+                            embeddings=await task,
+                            documents=[doc.page_content for doc in batch],
+                            metadatas=[doc.metadata for doc in batch]
+                        )
+
+                        progress.update(len(batch))
+
+            except BaseException:
+                # Don't leave embedding requests running (or their errors unretrieved)
+                for _, task in pending:
+                    task.cancel()
+                await asyncio.gather(*(task for _, task in pending), return_exceptions=True)
+                raise
+
+        # Invalidate cached document count
+        self._doc_count_cache = None
+        count = self.get_document_count()
 
         # Track ChromaDB indexing cost (custom metric)
-        mvk.add_metered_usage(
-            Metric(
-                name="chromadb.documents_indexed",
-                value=len(documents),
-                unit="document",
-                estimated_cost=config.TOOL_PRICES["chromadb_indexing"] * len(documents),
-                metadata={
-                    "total_documents": count,
-                    "batch_size": len(documents)
-                }
-            )
+        tracker.track_operation_with_cost(
+            "chromadb.documents_indexed",
+            "chromadb_indexing",
+            value=total,
+            unit="document",
+            metadata={
+                "total_documents": count,
+                "batch_size": batch_size
+            }
         )
 
-        print(f"✅ Indexed {count} documents in ChromaDB")
+        logger.info("✅ Indexed %d documents in ChromaDB", count)
+
+        return total
 
     def search(self, query: str, k: int = None) -> List[Document]:
         """
@@ -137,19 +316,33 @@ class ChromaDBManager:
 
     def is_indexed(self) -> bool:
         """Check if documents are indexed."""
-        try:
-            count = self.vectorstore._collection.count()
-            return count > 0
-        except Exception:
-            return False
+        if self._indexed_flag:
+            return True
+
+        # Only a positive answer is cached, so indexing done later is picked up
+        if self._refresh_count() > 0:
+            self._indexed_flag = True
+            return True
+
+        return False
 
     def get_document_count(self) -> int:
         """Get total number of indexed documents."""
+        if self._doc_count_cache is not None:
+            return self._doc_count_cache
+
+        return self._refresh_count()
+
+    def _refresh_count(self) -> int:
+        """Read the document count from the collection and cache it."""
         try:
-            return self.vectorstore._collection.count()
+            self._doc_count_cache = self.vectorstore._collection.count()
         except Exception:
+            # Not cached, so the next call retries
             return 0
 
+        return self._doc_count_cache
+
     def get_stats(self) -> dict:
         """Get ChromaDB statistics."""
         return {
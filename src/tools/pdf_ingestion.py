@@ -1,14 +1,157 @@
 """PDF ingestion and processing."""
 
+import asyncio
+import logging
+import multiprocessing
 import os
-from typing import List
-from langchain.document_loaders import PyPDFLoader
-from langchain.text_splitter import RecursiveCharacterTextSplitter
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import Callable, Deque, Iterator, List, Tuple
+import fitz
+import tiktoken
 from langchain.schema import Document
-import mvk_sdk as mvk
-from mvk_sdk import Metric
 
 from ..utils.config import config
+from ..utils.mvk_tracker import tracker
+
+
+logger = logging.getLogger(__name__)
+
+# Chunks are sized in tokens; the encoder is loaded once per process
+_ENC = tiktoken.get_encoding("cl100k_base")
+
+
+def _token_len(text: str, enc: tiktoken.Encoding = _ENC) -> int:
+    """
+    Token length used for chunk sizing.
+
+    ASCII text (most of the SDK docs) is estimated at ~4 characters per
+    token without encoding, rounded up so short pieces never count as 0;
+    anything else is measured with tiktoken.
+    """
+    if text.isascii():
+        return (len(text) + 3) >> 2
+    return len(enc.encode(text, disallowed_special=()))
+
+
+# Below this many pages a process pool costs more than it saves
+PARALLEL_MIN_PAGES = 32
+
+
+def _extract_pages(path: str, page_range: Tuple[int, int]) -> List[str]:
+    """Extract the text of pages [start, stop) (runs in a worker process)."""
+    start, stop = page_range
+    with fitz.open(path) as pdf:
+        return [pdf[i].get_text("text") for i in range(start, stop)]
+
+
+# (separator, suffix restored on every piece but the last, text used to rejoin pieces)
+SPLIT_LEVELS: Tuple[Tuple[str, str, str], ...] = (
+    ("\n\n", "", "\n\n"),
+    ("\n", "", "\n"),
+    (". ", ".", " "),
+    (" ", "", " "),
+)
+
+
+class FastSplitter:
+    """
+    Greedy text splitter for a fixed separator hierarchy.
+
+    Splits on paragraphs with str.split (a single C-level scan) and packs
+    the pieces greedily into chunks of at most chunk_size, carrying up to
+    chunk_overlap into the next chunk. Only a piece that is too long on
+    its own is split again at the next level (lines, sentences, words),
+    and as a last resort in halves.
+    """
+
+    def __init__(self, chunk_size: int, chunk_overlap: int, length_function: Callable[[str], int] = len):
+        """
+        Initialize splitter.
+
+        Args:
+            chunk_size: Maximum chunk length (as measured by length_function)
+            chunk_overlap: Maximum length carried over between adjacent chunks
+            length_function: Measures a piece of text (characters by default)
+
+        Raises:
+            ValueError: If the overlap is not smaller than the chunk size
+        """
+        if chunk_overlap >= chunk_size:
+            raise ValueError(f"chunk_overlap ({chunk_overlap}) must be smaller than chunk_size ({chunk_size})")
+
+        self._chunk_size = chunk_size
+        self._chunk_overlap = chunk_overlap
+        self._len = length_function
+
+    def split_text(self, text: str) -> List[str]:
+        """Split text into chunks."""
+        return [chunk for chunk in (c.strip() for c in self._split(text, 0)) if chunk]
+
+    def _split(self, text: str, level: int) -> List[str]:
+        """Split text on the separator at level and pack the pieces."""
+        if level == len(SPLIT_LEVELS):
+            return self._split_halves(text)
+
+        separator, suffix, joiner = SPLIT_LEVELS[level]
+        pieces = text.split(separator)
+        if suffix:
+            pieces = [piece + suffix for piece in pieces[:-1]] + pieces[-1:]
+
+        return self._pack(pieces, joiner, level)
+
+    def _pack(self, pieces: List[str], joiner: str, level: int) -> List[str]:
+        """Greedily merge pieces into chunks, keeping an overlap window."""
+        length = self._len
+        chunk_size = self._chunk_size
+        chunk_overlap = self._chunk_overlap
+        joiner_len = length(joiner)
+
+        chunks: List[str] = []
+        window: Deque[Tuple[str, int]] = deque()
+        total = 0
+
+        for piece in pieces:
+            if not piece:
+                continue
+
+            n = length(piece)
+            if n > chunk_size:
+                # Too long on its own: close the current chunk and split the piece finer
+                if window:
+                    chunks.append(joiner.join(p for p, _ in window))
+                    window.clear()
+                    total = 0
+                chunks.extend(self._split(piece, level + 1))
+                continue
+
+            added = n + joiner_len if window else n
+            if window and total + added > chunk_size:
+                chunks.append(joiner.join(p for p, _ in window))
+
+                # Keep at most chunk_overlap of the tail, leaving room for this piece
+                while window and (total > chunk_overlap or total + added > chunk_size):
+                    _, dropped = window.popleft()
+                    total -= dropped + joiner_len if window else dropped
+                    added = n + joiner_len if window else n
+
+            window.append((piece, n))
+            total += added
+
+        if window:
+            chunks.append(joiner.join(p for p, _ in window))
+
+        return chunks
+
+    def _split_halves(self, text: str) -> List[str]:
+        """Split text without separators until every part fits."""
+        if len(text) < 2 or self._len(text) <= self._chunk_size:
+            return [text]
+
+        middle = len(text) // 2
+        return self._split_halves(text[:middle]) + self._split_halves(text[middle:])
 
 
 class PDFIngestor:
@@ -20,100 +163,193 @@ class PDFIngestor:
 
         Args:
             pdf_path: Path to PDF file
-            chunk_size: Size of text chunks
-            chunk_overlap: Overlap between chunks
+            chunk_size: Size of text chunks (tokens)
+            chunk_overlap: Overlap between chunks (tokens)
         """
         self.pdf_path = pdf_path or config.PDF_PATH
         self.chunk_size = chunk_size or config.CHUNK_SIZE
         self.chunk_overlap = chunk_overlap or config.CHUNK_OVERLAP
 
-        self.text_splitter = RecursiveCharacterTextSplitter(
+        self.text_splitter = FastSplitter(
             chunk_size=self.chunk_size,
             chunk_overlap=self.chunk_overlap,
-            separators=["\n\n", "\n", ". ", " ", ""],
-            length_function=len,
+            length_function=_token_len,
         )
 
     def ingest(self) -> List[Document]:
         """
         Load and process PDF into chunks.
 
+        Prefer iter_chunks() when the consumer can work incrementally.
+
+        Returns:
+            List of Document chunks
+
+        Raises:
+            FileNotFoundError: If PDF file doesn't exist
+        """
+        return list(self.iter_chunks())
+
+    async def ingest_async(self) -> List[Document]:
+        """
+        Load and process PDF into chunks without blocking the event loop.
+
         Returns:
             List of Document chunks
 
         Raises:
             FileNotFoundError: If PDF file doesn't exist
         """
-        if not os.path.exists(self.pdf_path):
+        return await asyncio.to_thread(self.ingest)
+
+    def iter_chunks(self) -> Iterator[Document]:
+        """
+        Load and split the PDF, yielding each chunk as soon as it is created.
+
+        Each page is chunked right after it is read, and chunks carry their
+        final metadata, so neither pages nor chunks are accumulated here.
+
+        Yields:
+            Document chunks
+
+        Raises:
+            FileNotFoundError: If PDF file doesn't exist
+        """
+        try:
+            os.stat(self.pdf_path)
+        except FileNotFoundError:
             raise FileNotFoundError(
                 f"PDF file not found at {self.pdf_path}. "
                 f"Please place 'mvk_sdk_documentation.pdf' in the docs/ directory."
-            )
+            ) from None
 
-        # Stage 1: Load PDF
-        with mvk.create_signal(
-            name="tool.pdf_loader",
-            step_type="TOOL",
-            operation="load"
-        ):
-            print(f"📄 Loading PDF from {self.pdf_path}...")
-            loader = PyPDFLoader(self.pdf_path)
-            documents = loader.load()
-            print(f"✅ Loaded {len(documents)} pages")
+        logger.info(
+            "📄 Loading and splitting PDF from %s (size=%d, overlap=%d)...",
+            self.pdf_path, self.chunk_size, self.chunk_overlap
+        )
 
-            # Track PDF loading cost
-            mvk.add_metered_usage(
-                Metric(
-                    name="pdf.pages_loaded",
-                    value=len(documents),
-                    unit="page",
-                    estimated_cost=config.TOOL_PRICES["pdf_ingestion"] * len(documents),
-                    metadata={
-                        "file_path": self.pdf_path,
-                        "pages_loaded": len(documents)
-                    }
+        with fitz.open(self.pdf_path) as pdf:
+            page_count = pdf.page_count
+
+        # Load and split time are measured around the real work, since no
+        # signal can stay open across this generator's yields
+        chunk_count = 0
+        chunks_per_page: List[int] = []
+        load_seconds = split_seconds = 0.0
+        completed = False
+
+        pages = self._iter_page_texts(page_count)
+        try:
+            for page_number in range(page_count):
+                started = time.perf_counter()
+                page_text = next(pages)
+                load_seconds += time.perf_counter() - started
+
+                # Splitting is cheap next to parsing, so it stays on this process
+                started = time.perf_counter()
+                texts = self.text_splitter.split_text(page_text)
+                split_seconds += time.perf_counter() - started
+
+                chunks_per_page.append(len(texts))
+                for text in texts:
+                    yield Document(
+                        page_content=text,
+                        metadata={
+                            "page": page_number,
+                            "chunk_index": chunk_count,
+                            "source": "mvk_sdk_documentation.pdf"
+                        }
+                    )
+                    chunk_count += 1
+
+            completed = True
+            logger.info("✅ Loaded %d pages into %d chunks", page_count, chunk_count)
+
+        finally:
+            pages.close()
+
+            # Runs even if the consumer stops early or fails, so partial work is still reported
+            if not completed:
+                logger.warning(
+                    "⚠️  PDF ingestion stopped after %d of %d pages (%d chunks)",
+                    len(chunks_per_page), page_count, chunk_count
                 )
+            self._report_ingestion(chunks_per_page, chunk_count, load_seconds, split_seconds, completed)
+
+    def _report_ingestion(
+        self,
+        chunks_per_page: List[int],
+        chunk_count: int,
+        load_seconds: float,
+        split_seconds: float,
+        completed: bool
+    ) -> None:
+        """Report the page and chunk metrics with the measured load and split time."""
+        pages_loaded = len(chunks_per_page)
+
+        with tracker.track_tool("pdf_ingestion", "load_and_split"):
+            # Track PDF loading cost
+            tracker.track_operation_with_cost(
+                "pdf.pages_loaded",
+                "pdf_ingestion",
+                value=pages_loaded,
+                unit="page",
+                metadata={
+                    "file_path": self.pdf_path,
+                    "pages_loaded": pages_loaded,
+                    "load_seconds": round(load_seconds, 3),
+                    "completed": completed
+                }
             )
 
-        # Stage 2: Split into chunks
-        with mvk.create_signal(
-            name="tool.pdf_splitter",
-            step_type="TOOL",
-            operation="split"
-        ):
-            print(f"✂️  Splitting into chunks (size={self.chunk_size}, overlap={self.chunk_overlap})...")
-            chunks = self.text_splitter.split_documents(documents)
-            print(f"✅ Created {len(chunks)} chunks")
-
-            # Track PDF parsing cost
-            mvk.add_metered_usage(
-                Metric(
-                    name="pdf.chunks_created",
-                    value=len(chunks),
-                    unit="chunk",
-                    estimated_cost=config.TOOL_PRICES["pdf_parsing"],
-                    metadata={
-                        "chunk_size": self.chunk_size,
-                        "chunk_overlap": self.chunk_overlap,
-                        "total_chunks": len(chunks)
-                    }
-                )
+            # Track PDF parsing cost: one aggregated metric, not one per page
+            tracker.track_many(
+                "pdf.chunks_created",
+                chunks_per_page,
+                "chunk",
+                estimated_cost=tracker.price("pdf_parsing"),
+                metadata={
+                    "chunk_size": self.chunk_size,
+                    "chunk_overlap": self.chunk_overlap,
+                    "total_chunks": chunk_count,
+                    "split_seconds": round(split_seconds, 3),
+                    "completed": completed
+                }
             )
 
-        # Add metadata to chunks
-        for i, chunk in enumerate(chunks):
-            chunk.metadata["chunk_index"] = i
-            chunk.metadata["source"] = "mvk_sdk_documentation.pdf"
+    def _iter_page_texts(self, page_count: int) -> Iterator[str]:
+        """
+        Yield page texts in page order.
 
-        return chunks
+        Large PDFs are parsed in contiguous page ranges across a process
+        pool (parsing is CPU-bound); small ones are parsed in-process.
+        """
+        workers = os.cpu_count() or 1
+
+        if page_count < PARALLEL_MIN_PAGES or workers == 1:
+            yield from _extract_pages(self.pdf_path, (0, page_count))
+            return
+
+        # A few ranges per worker balances uneven pages without reopening the file per page
+        step = max(1, -(-page_count // (workers * 4)))
+        ranges = [(start, min(start + step, page_count)) for start in range(0, page_count, step)]
+
+        # Spawned, not forked: this process already runs threads (logging, MVK
+        # reporting, HTTP pools) whose locks a forked child could inherit held
+        spawn = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=workers, mp_context=spawn) as executor:
+            # map returns results in submission order, so pages stay ordered
+            for page_texts in executor.map(partial(_extract_pages, self.pdf_path), ranges):
+                yield from page_texts
 
     def get_stats(self) -> dict:
         """Get PDF statistics."""
-        if not os.path.exists(self.pdf_path):
+        # One stat call answers both "exists" and "how big"
+        try:
+            file_size = os.stat(self.pdf_path).st_size
+        except FileNotFoundError:
             return {"exists": False}
 
-        file_size = os.path.getsize(self.pdf_path)
-
         return {
             "exists": True,
             "path": self.pdf_path,
@@ -1,19 +1,40 @@
 """Tavily web search integration."""
 
-from typing import List, Dict, Optional
-from tavily import TavilyClient
-import mvk_sdk as mvk
-from mvk_sdk import Metric
+import asyncio
+import logging
+import threading
+from typing import List, Dict, Optional, Tuple
+from cachetools import TTLCache
 
 from ..utils.config import config
+from ..utils.http import ASYNC_HTTPX, SHARED_HTTPX
+from ..utils.mvk_tracker import tracker
+
+
+logger = logging.getLogger(__name__)
+
+TAVILY_SEARCH_URL = "https://api.tavily.com/search"
+
+# Search results change on the order of days, so identical searches are reused for a while
+_cache: TTLCache = TTLCache(maxsize=512, ttl=config.TAVILY_CACHE_TTL)
+_cache_lock = threading.Lock()
+
+# Per framework: query prefix and preferred (official docs and GitHub) domains
+_FRAMEWORK_PROFILES: Dict[str, Tuple[str, Tuple[str, ...]]] = {
+    "langchain": ("langchain", ("python.langchain.com", "github.com/langchain-ai")),
+    "llamaindex": ("llamaindex", ("docs.llamaindex.ai", "github.com/run-llama")),
+    "crewai": ("crewai", ("docs.crewai.com", "github.com/joaomdmoura/crewai")),
+    "autogen": ("autogen", ("microsoft.github.io/autogen", "github.com/microsoft/autogen")),
+    "haystack": ("haystack", ("docs.haystack.deepset.ai", "github.com/deepset-ai/haystack")),
+}
 
 
 class TavilySearch:
     """Web search using Tavily API."""
 
     def __init__(self):
-        """Initialize Tavily client."""
-        self.client = TavilyClient(api_key=config.TAVILY_API_KEY)
+        """Initialize Tavily search."""
+        self.api_key = config.TAVILY_API_KEY
 
     def search(
         self,
@@ -34,57 +55,205 @@ class TavilySearch:
         Returns:
             List of search results with title, url, content
         """
-        with mvk.create_signal(
-            name="tool.tavily_search",
-            step_type="TOOL",
-            operation="web_search"
-        ):
+        cache_key = self._cache_key(query, max_results, search_depth, include_domains)
+        cached = self._cache_get(cache_key, max_results, search_depth, include_domains)
+        if cached is not None:
+            return cached
+
+        with tracker.track_tool("tavily_search", "web_search"):
             try:
-                # Build search parameters
-                search_params = {
-                    "query": query,
-                    "max_results": max_results,
-                    "search_depth": search_depth,
-                }
+                # Perform search
+                response = self._post_sync(
+                    self._build_params(query, max_results, search_depth, include_domains)
+                )
 
-                if include_domains:
-                    search_params["include_domains"] = include_domains
+                results = self._parse_results(response, max_results, search_depth, include_domains)
+                self._cache_set(cache_key, results)
 
-                # Perform search
-                response = self.client.search(**search_params)
-
-                # Extract results
-                results = []
-                for item in response.get("results", []):
-                    results.append({
-                        "title": item.get("title", ""),
-                        "url": item.get("url", ""),
-                        "content": item.get("content", ""),
-                        "score": item.get("score", 0.0)
-                    })
-
-                # Track Tavily search cost
-                mvk.add_metered_usage(
-                    Metric(
-                        name="tavily.search",
-                        value=1,
-                        unit="search",
-                        estimated_cost=config.TOOL_PRICES["tavily_search"],
-                        metadata={
-                            "max_results": max_results,
-                            "search_depth": search_depth,
-                            "results_returned": len(results),
-                            "domains": include_domains if include_domains else "all"
-                        }
-                    )
+                return results
+
+            except Exception:
+                logger.exception("❌ Tavily search error")
+                return []
+
+    async def search_async(
+        self,
+        query: str,
+        max_results: int = 3,
+        search_depth: str = "advanced",
+        include_domains: Optional[List[str]] = None
+    ) -> List[Dict[str, str]]:
+        """
+        Perform web search without blocking the event loop.
+
+        Calls the Tavily REST API over the shared async HTTP pool.
+
+        Args:
+            query: Search query
+            max_results: Maximum number of results
+            search_depth: Search depth ("basic" or "advanced")
+            include_domains: List of domains to include
+
+        Returns:
+            List of search results with title, url, content
+        """
+        cache_key = self._cache_key(query, max_results, search_depth, include_domains)
+        cached = self._cache_get(cache_key, max_results, search_depth, include_domains)
+        if cached is not None:
+            return cached
+
+        with tracker.track_tool("tavily_search", "web_search"):
+            try:
+                response = await self._post(
+                    self._build_params(query, max_results, search_depth, include_domains)
                 )
 
+                results = self._parse_results(response, max_results, search_depth, include_domains)
+                self._cache_set(cache_key, results)
+
                 return results
 
-            except Exception as e:
-                print(f"❌ Tavily search error: {e}")
+            except Exception:
+                logger.exception("❌ Tavily search error")
                 return []
 
+    async def search_many(self, queries: List[str], **kwargs) -> List[List[Dict[str, str]]]:
+        """
+        Run several searches concurrently.
+
+        Args:
+            queries: Search queries
+            **kwargs: Search options shared by every query (see search_async)
+
+        Returns:
+            One result list per query, in the same order
+        """
+        return await asyncio.gather(*(self.search_async(query, **kwargs) for query in queries))
+
+    def _post_sync(self, payload: Dict[str, any]) -> Dict[str, any]:
+        """POST a search request to the Tavily REST API over the shared keep-alive pool."""
+        response = SHARED_HTTPX.post(
+            TAVILY_SEARCH_URL,
+            json=payload,
+            headers={"Authorization": f"Bearer {self.api_key}"}
+        )
+        response.raise_for_status()
+
+        return response.json()
+
+    async def _post(self, payload: Dict[str, any]) -> Dict[str, any]:
+        """POST a search request to the Tavily REST API."""
+        response = await ASYNC_HTTPX.get().post(
+            TAVILY_SEARCH_URL,
+            json=payload,
+            headers={"Authorization": f"Bearer {self.api_key}"}
+        )
+        response.raise_for_status()
+
+        return response.json()
+
+    def _cache_key(
+        self,
+        query: str,
+        max_results: int,
+        search_depth: str,
+        include_domains: Optional[List[str]]
+    ) -> tuple:
+        """Key identifying a search request."""
+        return (" ".join(query.lower().split()), max_results, search_depth, tuple(include_domains or ()))
+
+    def _cache_get(
+        self,
+        cache_key: tuple,
+        max_results: int,
+        search_depth: str,
+        include_domains: Optional[List[str]]
+    ) -> Optional[List[Dict[str, str]]]:
+        """Return cached results for a search, recording the (free) cache hit."""
+        with _cache_lock:
+            cached = _cache.get(cache_key)
+
+        if cached is None:
+            return None
+
+        # Still reported so usage reflects every search, but at no cost
+        tracker.track_metric_nowait(
+            "tavily.search",
+            1,
+            "search",
+            metadata={
+                "max_results": max_results,
+                "search_depth": search_depth,
+                "results_returned": len(cached),
+                "domains": include_domains if include_domains else "all",
+                "cache_hit": True
+            }
+        )
+
+        return list(cached)
+
+    def _cache_set(self, cache_key: tuple, results: List[Dict[str, str]]) -> None:
+        """Cache search results worth reusing."""
+        # Don't pin empty (failed) or low-quality result sets for the whole TTL
+        if results and all(r.get("score", 0.0) >= config.TAVILY_CACHE_MIN_SCORE for r in results):
+            with _cache_lock:
+                _cache[cache_key] = list(results)
+
+    def _build_params(
+        self,
+        query: str,
+        max_results: int,
+        search_depth: str,
+        include_domains: Optional[List[str]]
+    ) -> Dict[str, any]:
+        """Build Tavily search parameters."""
+        search_params = {
+            "query": query,
+            "max_results": max_results,
+            "search_depth": search_depth,
+        }
+
+        if include_domains:
+            search_params["include_domains"] = include_domains
+
+        return search_params
+
+    def _parse_results(
+        self,
+        response: Dict[str, any],
+        max_results: int,
+        search_depth: str,
+        include_domains: Optional[List[str]]
+    ) -> List[Dict[str, str]]:
+        """Extract results from a Tavily response and record the search cost."""
+        # Extract results
+        items = response.get("results", ())
+        results = [
+            {
+                "title": item.get("title", ""),
+                "url": item.get("url", ""),
+                "content": item.get("content", ""),
+                "score": item.get("score", 0.0)
+            }
+            for item in items
+        ]
+
+        # Track Tavily search cost (reported in the background)
+        tracker.track_operation_with_cost(
+            "tavily.search",
+            "tavily_search",
+            unit="search",
+            metadata={
+                "max_results": max_results,
+                "search_depth": search_depth,
+                "results_returned": len(results),
+                "domains": include_domains if include_domains else "all",
+                "cache_hit": False
+            }
+        )
+
+        return results
+
     def search_framework(
         self,
         framework_name: str,
@@ -102,31 +271,16 @@ class TavilySearch:
         Returns:
             List of search results
         """
-        # Construct framework-specific query
-        full_query = f"{framework_name} {query}"
-
-        # Prefer official docs and GitHub
-        domains = self._get_framework_domains(framework_name)
+        # Prefer official docs and GitHub; unknown frameworks search the whole web
+        prefix, domains = _FRAMEWORK_PROFILES.get(framework_name.lower(), (framework_name, ()))
 
         return self.search(
-            query=full_query,
+            query=f"{prefix} {query}",
             max_results=max_results,
             search_depth="advanced",
-            include_domains=domains if domains else None
+            include_domains=list(domains) or None
         )
 
-    def _get_framework_domains(self, framework_name: str) -> Optional[List[str]]:
-        """Get preferred domains for each framework."""
-        framework_domains = {
-            "langchain": ["python.langchain.com", "github.com/langchain-ai"],
-            "llamaindex": ["docs.llamaindex.ai", "github.com/run-llama"],
-            "crewai": ["docs.crewai.com", "github.com/joaomdmoura/crewai"],
-            "autogen": ["microsoft.github.io/autogen", "github.com/microsoft/autogen"],
-            "haystack": ["docs.haystack.deepset.ai", "github.com/deepset-ai/haystack"],
-        }
-
-        return framework_domains.get(framework_name.lower())
-
     def format_results(self, results: List[Dict[str, str]]) -> str:
         """
         Format search results as text.
@@ -140,14 +294,16 @@ class TavilySearch:
         if not results:
             return "No results found."
 
-        formatted = "Search Results:\n\n"
+        parts = ["Search Results:\n\n"]
 
         for i, result in enumerate(results, 1):
-            formatted += f"{i}. **{result['title']}**\n"
-            formatted += f"   URL: {result['url']}\n"
-            formatted += f"   {result['content'][:300]}...\n\n"
+            parts.append(
+                f"{i}. **{result['title']}**\n"
+                f"   URL: {result['url']}\n"
+                f"   {result['content'][:300]}...\n\n"
+            )
 
-        return formatted
+        return "".join(parts)
 
     def get_combined_context(self, results: List[Dict[str, str]]) -> str:
         """
@@ -162,12 +318,10 @@ class TavilySearch:
         if not results:
             return ""
 
-        context = ""
-        for result in results:
-            context += f"Source: {result['title']} ({result['url']})\n"
-            context += f"{result['content']}\n\n"
-
-        return context
+        return "".join(
+            f"Source: {result['title']} ({result['url']})\n{result['content']}\n\n"
+            for result in results
+        )
 
 
 # Export singleton instance
@@ -1,15 +1,33 @@
 """Configuration management for Mavvrik SDK Assistant."""
 
 import os
-from typing import Optional
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import Mapping, Optional
 from dotenv import load_dotenv
 
 # Load environment variables
 load_dotenv()
 
 
+# MVK SDK Tool Pricing (for custom cost tracking); read-only once loaded
+TOOL_PRICES: Mapping[str, float] = MappingProxyType({
+    # Vector database operations
+    "chromadb_search": 0.0001,          # Per search operation
+    "chromadb_indexing": 0.0005,        # Per document indexed
+
+    # Web search operations
+    "tavily_search": 0.001,             # Per search request
+
+    # PDF processing operations
+    "pdf_ingestion": 0.002,             # Per page loaded
+    "pdf_parsing": 0.001,               # Per document parsed
+})
+
+
+@dataclass(frozen=True, slots=True)
 class Config:
-    """Application configuration."""
+    """Application configuration (read once from the environment, then immutable)."""
 
     # OpenAI Configuration
     OPENAI_API_KEY: str = os.getenv("OPENAI_API_KEY", "")
@@ -18,20 +36,28 @@ class Config:
 
     # Tavily Configuration
     TAVILY_API_KEY: str = os.getenv("TAVILY_API_KEY", "")
+    TAVILY_CACHE_TTL: int = int(os.getenv("TAVILY_CACHE_TTL", "3600"))
+    TAVILY_CACHE_MIN_SCORE: float = 0.3
 
     # MVK SDK Configuration
     MVK_API_KEY: str = os.getenv("MVK_API_KEY", "")
     MVK_AGENT_ID: str = os.getenv("MVK_AGENT_ID", "mavvrik-sdk-assistant")
     MVK_TENANT_ID: str = os.getenv("MVK_TENANT_ID", "mavvrik-internal")
+    MVK_BATCHING: bool = os.getenv("MVK_BATCHING", "true").lower() == "true"
+    MVK_BATCH_SIZE: int = int(os.getenv("MVK_BATCH_SIZE", "32"))
+    MVK_FLUSH_INTERVAL: float = float(os.getenv("MVK_FLUSH_INTERVAL", "2"))
 
     # ChromaDB Configuration
     CHROMA_COLLECTION: str = os.getenv("CHROMA_COLLECTION", "mvk_sdk_docs")
     CHROMA_PERSIST_DIR: str = os.getenv("CHROMA_PERSIST_DIR", "./chroma/data")
 
     # Document Processing
-    CHUNK_SIZE: int = 500
-    CHUNK_OVERLAP: int = 50
+    # Chunk sizes are in cl100k_base tokens (estimated as characters / 4 for ASCII text)
+    CHUNK_SIZE: int = 256
+    CHUNK_OVERLAP: int = 32
     TOP_K_RESULTS: int = 5
+    INDEX_BATCH_SIZE: int = 100
+    INDEX_CONCURRENCY: int = 8
 
     # Chainlit Configuration
     CHAINLIT_PORT: int = int(os.getenv("CHAINLIT_PORT", "8000"))
@@ -42,6 +68,9 @@ class Config:
     # PDF Documentation Path
     PDF_PATH: str = "./docs/mvk_sdk_documentation.pdf"
 
+    # Logging
+    LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
+
     # Rate Limiting
     MAX_REQUESTS_PER_MINUTE: int = 20
 
@@ -51,48 +80,50 @@ class Config:
     LLM_TEMPERATURE_FRAMEWORK: float = 0.2
     LLM_TEMPERATURE_CODE: float = 0.3
 
-    # MVK SDK Tool Pricing (for custom cost tracking)
-    TOOL_PRICES = {
-        # Vector database operations
-        "chromadb_search": 0.0001,          # Per search operation
-        "chromadb_indexing": 0.0005,        # Per document indexed
+    # Answer multi-agent intents with a single batched LLM call (no Tavily sources)
+    ENABLE_BATCHED_ROUTING: bool = os.getenv("ENABLE_BATCHED_ROUTING", "false").lower() == "true"
+
+    # LLM Response Cache
+    LLM_CACHE_SIZE: int = int(os.getenv("LLM_CACHE_SIZE", "512"))
+    LLM_CACHE_MAX_TEMPERATURE: float = 0.3
 
-        # Web search operations
-        "tavily_search": 0.001,             # Per search request
+    # Semantic Cache (framework questions)
+    SEMANTIC_CACHE_THRESHOLD: float = float(os.getenv("SEMANTIC_CACHE_THRESHOLD", "0.85"))
+    SEMANTIC_CACHE_SIZE: int = 256
 
-        # PDF processing operations
-        "pdf_ingestion": 0.002,             # Per page loaded
-        "pdf_parsing": 0.001,               # Per document parsed
-    }
+    # SDK Answer Cache (Chroma-backed, keyed on question + retrieved context)
+    SDK_CACHE_COLLECTION: str = "sdk_llm_cache"
+    SDK_CACHE_THRESHOLD: float = 0.92
+    SDK_CACHE_TTL: int = int(os.getenv("SDK_CACHE_TTL", "86400"))
+
+    # MVK SDK Tool Pricing (for custom cost tracking)
+    TOOL_PRICES: Mapping[str, float] = field(default_factory=lambda: TOOL_PRICES)
 
-    @classmethod
-    def validate(cls) -> list[str]:
+    def validate(self) -> list[str]:
         """Validate required configuration and return list of errors."""
         errors = []
 
-        if not cls.OPENAI_API_KEY:
+        if not self.OPENAI_API_KEY:
             errors.append("OPENAI_API_KEY is required. Get one at https://platform.openai.com/api-keys")
 
-        if not cls.TAVILY_API_KEY:
+        if not self.TAVILY_API_KEY:
             errors.append("TAVILY_API_KEY is required. Get one at https://app.tavily.com")
 
-        if not cls.MVK_API_KEY:
+        if not self.MVK_API_KEY:
             errors.append("MVK_API_KEY is required for tracking")
 
-        if not os.path.exists(cls.PDF_PATH):
-            errors.append(f"PDF documentation not found at {cls.PDF_PATH}. Please add mvk_sdk_documentation.pdf")
+        if not os.path.exists(self.PDF_PATH):
+            errors.append(f"PDF documentation not found at {self.PDF_PATH}. Please add mvk_sdk_documentation.pdf")
 
         return errors
 
-    @classmethod
-    def is_valid(cls) -> bool:
+    def is_valid(self) -> bool:
         """Check if all required configuration is present."""
-        return len(cls.validate()) == 0
+        return len(self.validate()) == 0
 
-    @classmethod
-    def get_error_message(cls) -> str:
+    def get_error_message(self) -> str:
         """Get formatted error message for missing configuration."""
-        errors = cls.validate()
+        errors = self.validate()
         if not errors:
             return ""
 
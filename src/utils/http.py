@@ -0,0 +1,63 @@
+"""Shared HTTP connection pools for outbound API calls."""
+
+import asyncio
+import weakref
+from typing import Callable, Generic, TypeVar
+
+import httpx
+
+
+T = TypeVar("T")
+
+# Sized for the concurrent agent calls made per query across all sessions
+HTTP_LIMITS = httpx.Limits(max_connections=64, max_keepalive_connections=32)
+HTTP_TIMEOUT = 30.0
+
+
+class LoopLocal(Generic[T]):
+    """
+    One lazily built value per running event loop.
+
+    An httpx.AsyncClient (and any client wrapping one) binds its pooled
+    connections to the loop that opened them, so async clients are never
+    shared across loops; each loop gets its own. Short-lived loops (one
+    asyncio.run per call) must await aclose() before they finish, or the
+    value's connections are leaked with the loop.
+    """
+
+    def __init__(self, factory: Callable[[], T]):
+        """
+        Initialize loop-local value.
+
+        Args:
+            factory: Builds the value; called from inside the running loop
+        """
+        self._factory = factory
+        self._values: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, T]" = weakref.WeakKeyDictionary()
+
+    def get(self) -> T:
+        """Return the value for the running event loop, building it on first use."""
+        loop = asyncio.get_running_loop()
+
+        value = self._values.get(loop)
+        if value is None:
+            value = self._values[loop] = self._factory()
+
+        return value
+
+    async def aclose(self) -> None:
+        """Drop the running loop's value, closing it if it is closable."""
+        value = self._values.pop(asyncio.get_running_loop(), None)
+
+        aclose = getattr(value, "aclose", None)
+        if aclose is not None:
+            await aclose()
+
+
+# One sync pool reused by every LLM, embeddings and search client
+SHARED_HTTPX = httpx.Client(http2=True, limits=HTTP_LIMITS, timeout=HTTP_TIMEOUT)
+
+# Async pool for the running event loop: ASYNC_HTTPX.get()
+ASYNC_HTTPX: LoopLocal[httpx.AsyncClient] = LoopLocal(
+    lambda: httpx.AsyncClient(http2=True, limits=HTTP_LIMITS, timeout=HTTP_TIMEOUT)
+)
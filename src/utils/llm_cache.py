@@ -0,0 +1,73 @@
+"""In-process LLM response cache."""
+
+import hashlib
+import threading
+from typing import Any, Callable
+
+from cachetools import LFUCache
+
+from .config import config
+
+
+_cache: LFUCache = LFUCache(maxsize=config.LLM_CACHE_SIZE)
+_lock = threading.Lock()
+
+
+def normalize_query(query: str) -> str:
+    """Normalize query text so trivially different phrasings share a key."""
+    return " ".join(query.lower().split())
+
+
+def make_cache_key(template_name: str, *parts: Any, temperature: float) -> str:
+    """
+    Build a cache key for an LLM call.
+
+    Args:
+        template_name: Name of the prompt template being rendered
+        *parts: Dynamic inputs of the prompt (query, contexts, framework)
+        temperature: Sampling temperature of the call
+
+    Returns:
+        Hex digest identifying the call
+    """
+    raw = "|".join([template_name, config.LLM_MODEL, str(temperature), *map(str, parts)])
+    return hashlib.blake2b(raw.encode(), digest_size=16).hexdigest()
+
+
+def cached_invoke(cache_key: str, fn: Callable[[], Any], temperature: float) -> Any:
+    """
+    Return the cached result for `cache_key`, calling `fn` on a miss.
+
+    Calls above LLM_CACHE_MAX_TEMPERATURE are never cached since their
+    output is expected to vary. Results flagged with success=False are
+    returned but not stored.
+
+    Args:
+        cache_key: Key from make_cache_key
+        fn: Zero-argument callable performing the LLM call
+        temperature: Sampling temperature of the call
+
+    Returns:
+        Result of `fn` (possibly from cache)
+    """
+    if temperature > config.LLM_CACHE_MAX_TEMPERATURE:
+        return fn()
+
+    with _lock:
+        cached = _cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    result = fn()
+
+    if not (isinstance(result, dict) and result.get("success") is False):
+        with _lock:
+            _cache[cache_key] = result
+
+    return result
+
+
+def clear_cache() -> None:
+    """Drop all cached responses."""
+    with _lock:
+        _cache.clear()
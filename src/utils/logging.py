@@ -0,0 +1,45 @@
+"""Logging setup that keeps log I/O off the request path."""
+
+import atexit
+import logging
+import logging.handlers
+import queue
+from typing import Optional
+
+from .config import config
+
+
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+def setup_logging(level: Optional[str] = None) -> None:
+    """
+    Route log records through a queue drained by a background thread.
+
+    Request threads only enqueue records; formatting and stream writes
+    happen on the listener thread. Only the first call has an effect.
+
+    Args:
+        level: Root log level (defaults to config.LOG_LEVEL)
+    """
+    global _listener
+
+    if _listener is not None:
+        return
+
+    log_queue: queue.Queue = queue.Queue(-1)
+
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(
+        logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s")
+    )
+
+    root = logging.getLogger()
+    root.addHandler(logging.handlers.QueueHandler(log_queue))
+    root.setLevel(level or config.LOG_LEVEL)
+
+    _listener = logging.handlers.QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    _listener.start()
+
+    # Flush queued records on interpreter shutdown
+    atexit.register(_listener.stop)
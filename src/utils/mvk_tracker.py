@@ -0,0 +1,226 @@
+"""MVK SDK tracking helpers."""
+
+import contextvars
+import functools
+import logging
+import queue
+import threading
+import uuid
+from contextlib import contextmanager
+from typing import Any, Callable, ContextManager, Dict, Iterator, List, Optional
+
+import mvk_sdk as mvk
+from mvk_sdk import Metric
+
+from .config import config
+
+
+logger = logging.getLogger(__name__)
+
+# Unit price per operation: the one (read-only) pricing table, bound once at import
+TOOL_PRICES = config.TOOL_PRICES
+
+
+@functools.lru_cache(maxsize=None)
+def _warn_unpriced(operation: str) -> None:
+    """Warn (once per operation) that an operation has no entry in config.TOOL_PRICES."""
+    logger.warning("⚠️  No price for operation %r in config.TOOL_PRICES; reporting $0", operation)
+
+
+@functools.lru_cache(maxsize=64)
+def _tool_signal_factory(tool_name: str, operation: str) -> Callable[[], ContextManager]:
+    """Return a zero-arg factory for a tool's signal, with its arguments bound once."""
+    return functools.partial(
+        mvk.create_signal,
+        name=f"tool.{tool_name}",
+        step_type="TOOL",
+        operation=operation
+    )
+
+
+class MVKTracker:
+    """
+    Thin wrapper around MVK SDK metric reporting.
+
+    The *_nowait methods hand metrics to a background thread so reporting
+    never blocks a user request. Each metric is emitted inside a copy of the
+    caller's context, so it is still attributed to the caller's MVK
+    signal and business context (user, session, tenant).
+    """
+
+    def __init__(self):
+        """Initialize tracker and start the background reporting thread."""
+        self._queue: queue.Queue = queue.Queue()
+        self._worker = threading.Thread(target=self._drain, name="mvk-tracker", daemon=True)
+        self._worker.start()
+
+    def create_session_id(self) -> str:
+        """Create a unique session ID."""
+        return f"session-{uuid.uuid4().hex}"
+
+    @contextmanager
+    def track_tool(self, tool_name: str, operation: str) -> Iterator[None]:
+        """
+        Run a block inside the "tool.<tool_name>" MVK signal.
+
+        Args:
+            tool_name: Tool name (e.g. "tavily_search")
+            operation: Signal operation (e.g. "web_search")
+        """
+        with _tool_signal_factory(tool_name, operation)():
+            yield
+
+    def track_metric(
+        self,
+        name: str,
+        value: float,
+        unit: str,
+        estimated_cost: float = 0.0,
+        metadata: Optional[Dict[str, Any]] = None
+    ) -> None:
+        """
+        Report a custom metric synchronously.
+
+        Args:
+            name: Metric name (e.g. "chromadb.search")
+            value: Metric value
+            unit: Unit of the value
+            estimated_cost: Estimated cost in USD
+            metadata: Additional metric metadata
+        """
+        mvk.add_metered_usage(
+            Metric(
+                name=name,
+                value=value,
+                unit=unit,
+                estimated_cost=estimated_cost,
+                metadata=metadata or {}
+            )
+        )
+
+    def track_metric_nowait(
+        self,
+        name: str,
+        value: float,
+        unit: str,
+        estimated_cost: float = 0.0,
+        metadata: Optional[Dict[str, Any]] = None
+    ) -> None:
+        """
+        Queue a custom metric for background reporting.
+
+        Args:
+            name: Metric name (e.g. "chromadb.search")
+            value: Metric value
+            unit: Unit of the value
+            estimated_cost: Estimated cost in USD
+            metadata: Additional metric metadata
+        """
+        self._queue.put_nowait((
+            contextvars.copy_context(),
+            (name, value, unit, estimated_cost, metadata)
+        ))
+
+    def track_operation_with_cost(
+        self,
+        name: str,
+        operation: str,
+        value: float = 1,
+        unit: str = "operation",
+        metadata: Optional[Dict[str, Any]] = None
+    ) -> None:
+        """
+        Queue a metric priced from config.TOOL_PRICES.
+
+        Args:
+            name: Metric name
+            operation: Key into config.TOOL_PRICES (unit price); unpriced operations cost 0 (with a warning)
+            value: Number of units
+            unit: Unit of the value
+            metadata: Additional metric metadata
+        """
+        self.track_metric_nowait(
+            name,
+            value,
+            unit,
+            estimated_cost=self.price(operation, value),
+            metadata=metadata
+        )
+
+    def price(self, operation: str, units: float = 1) -> float:
+        """
+        Estimated cost in USD of an operation.
+
+        Args:
+            operation: Key into config.TOOL_PRICES; unpriced operations cost 0 (with a warning)
+            units: Number of units
+        """
+        unit_price = TOOL_PRICES.get(operation)
+        if unit_price is None:
+            _warn_unpriced(operation)
+            return 0.0
+
+        return unit_price * units
+
+    def track_many(
+        self,
+        name: str,
+        quantities: List[float],
+        unit: str,
+        estimated_cost: float = 0.0,
+        metadata: Optional[Dict[str, Any]] = None
+    ) -> None:
+        """
+        Queue one aggregated metric for many per-item quantities.
+
+        Reports a single metric whose value is the total, with the
+        individual quantities kept in metadata["per_item"], instead of
+        one metric per item.
+
+        Args:
+            name: Metric name
+            quantities: Per-item quantities (e.g. chunks per page)
+            unit: Unit of the quantities
+            estimated_cost: Estimated cost in USD for the whole batch
+            metadata: Additional metric metadata
+        """
+        self.track_metric_nowait(
+            name,
+            sum(quantities),
+            unit,
+            estimated_cost=estimated_cost,
+            metadata={**(metadata or {}), "per_item": list(quantities)}
+        )
+
+    def track_feedback(self, feedback: str) -> None:
+        """
+        Queue a user feedback event.
+
+        Args:
+            feedback: Feedback type ("helpful" or "not_helpful")
+        """
+        self.track_metric_nowait(
+            "user.feedback",
+            1,
+            "feedback",
+            metadata={"feedback": feedback}
+        )
+
+    def flush(self) -> None:
+        """Block until every queued metric has been reported."""
+        self._queue.join()
+
+    def _drain(self) -> None:
+        """Report queued metrics until the process exits."""
+        while True:
+            context, args = self._queue.get()
+            try:
+                context.run(self.track_metric, *args)
+            except Exception:
+                logger.exception("⚠️  MVK metric error")
+            finally:
+                self._queue.task_done()
+
+
+# Export singleton instance
+tracker = MVKTracker()
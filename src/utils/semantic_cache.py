@@ -0,0 +1,224 @@
+"""Embedding-similarity cache for semantically equivalent questions."""
+
+import hashlib
+import json
+import logging
+import threading
+import time
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from langchain_openai import OpenAIEmbeddings
+
+from .config import config
+from .http import SHARED_HTTPX
+
+
+logger = logging.getLogger(__name__)
+
+
+@lru_cache(maxsize=1)
+def _get_embeddings() -> OpenAIEmbeddings:
+    """Create the embeddings client shared by all semantic caches."""
+    return OpenAIEmbeddings(
+        model=config.EMBEDDING_MODEL,
+        openai_api_key=config.OPENAI_API_KEY,
+        http_client=SHARED_HTTPX
+    )
+
+
+@lru_cache(maxsize=1024)
+def _embed(text: str) -> np.ndarray:
+    """Embed text as a read-only unit vector (memoized so get/set embed only once)."""
+    vector = np.asarray(_get_embeddings().embed_query(text), dtype=np.float32)
+    vector /= np.linalg.norm(vector) or 1.0
+    vector.flags.writeable = False
+    return vector
+
+
+class SemanticCache:
+    """
+    Small in-memory cache matching entries by cosine similarity.
+
+    Unit vectors are kept as rows of one matrix, so a lookup is a single
+    matrix-vector product instead of a Python loop over entries.
+    """
+
+    def __init__(self, threshold: Optional[float] = None, maxsize: Optional[int] = None):
+        """
+        Initialize semantic cache.
+
+        Args:
+            threshold: Minimum cosine similarity for a hit
+            maxsize: Maximum number of entries (oldest are evicted first)
+        """
+        self.threshold = threshold if threshold is not None else config.SEMANTIC_CACHE_THRESHOLD
+        self.maxsize = maxsize or config.SEMANTIC_CACHE_SIZE
+
+        # Ring buffer: row i of _matrix is the vector for _values[i]
+        self._matrix: Optional[np.ndarray] = None
+        self._values: List[Optional[str]] = [None] * self.maxsize
+        self._count = 0
+        self._next = 0
+        self._lock = threading.Lock()
+
+    def get(self, text: str) -> Tuple[bool, float, Optional[Any]]:
+        """
+        Look up the most similar cached entry.
+
+        Args:
+            text: Text to match
+
+        Returns:
+            Tuple of (hit, best similarity, cached value or None)
+        """
+        try:
+            vector = _embed(text)
+        except Exception as e:
+            logger.warning("⚠️  Semantic cache embedding error: %s", e)
+            return False, 0.0, None
+
+        with self._lock:
+            if not self._count:
+                return False, 0.0, None
+
+            similarities = self._matrix[:self._count] @ vector
+            best = int(np.argmax(similarities))
+            best_similarity = float(similarities[best])
+            best_value = self._values[best]
+
+        if best_similarity >= self.threshold:
+            return True, best_similarity, json.loads(best_value)
+
+        return False, max(best_similarity, 0.0), None
+
+    def set(self, text: str, value: Any) -> None:
+        """
+        Store a JSON-serializable value for text.
+
+        Args:
+            text: Text the value answers
+            value: Value to cache
+        """
+        try:
+            vector = _embed(text)
+        except Exception as e:
+            logger.warning("⚠️  Semantic cache embedding error: %s", e)
+            return
+
+        serialized = json.dumps(value)
+
+        with self._lock:
+            if self._matrix is None:
+                self._matrix = np.empty((self.maxsize, vector.shape[0]), dtype=np.float32)
+
+            # Overwrites the oldest entry once full
+            self._matrix[self._next] = vector
+            self._values[self._next] = serialized
+            self._next = (self._next + 1) % self.maxsize
+            self._count = min(self._count + 1, self.maxsize)
+
+    def clear(self) -> None:
+        """Drop all cached entries."""
+        with self._lock:
+            self._values = [None] * self.maxsize
+            self._count = 0
+            self._next = 0
+
+
+class LLMSemanticCache:
+    """
+    Persistent answer cache stored in a Chroma collection.
+
+    Entries are matched by question embedding, but only among entries built
+    from the same retrieved context and younger than the TTL, so a cached
+    answer is never reused for different documentation.
+    """
+
+    def __init__(self, collection, embeddings, threshold: Optional[float] = None, ttl: Optional[int] = None):
+        """
+        Initialize LLM semantic cache.
+
+        Args:
+            collection: Chroma collection using cosine distance
+            embeddings: Object with embed_query used to embed questions
+            threshold: Minimum cosine similarity for a hit
+            ttl: Entry lifetime in seconds
+        """
+        self.collection = collection
+        self.embeddings = embeddings
+        self.threshold = threshold if threshold is not None else config.SDK_CACHE_THRESHOLD
+        self.ttl = ttl if ttl is not None else config.SDK_CACHE_TTL
+
+    @staticmethod
+    def context_hash(context: str) -> str:
+        """Hash retrieved context for use as a metadata filter."""
+        return hashlib.sha256(context.encode("utf-8")).hexdigest()
+
+    def embed(self, question: str) -> List[float]:
+        """Embed a question (pass the result to get and set to embed once)."""
+        return self.embeddings.embed_query(question)
+
+    def get(self, vector: List[float], ctx_hash: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a cached answer.
+
+        Args:
+            vector: Question embedding
+            ctx_hash: Hash of the retrieved context
+
+        Returns:
+            Dictionary with answer and sources, or None on a miss
+        """
+        try:
+            results = self.collection.query(
+                query_embeddings=[vector],
+                n_results=1,
+                where={"$and": [
+                    {"ctx_hash": ctx_hash},
+                    {"ts": {"$gt": time.time() - self.ttl}}
+                ]},
+                include=["metadatas", "distances"]
+            )
+        except Exception:
+            logger.exception("⚠️  SDK answer cache lookup error")
+            return None
+
+        if not results["ids"] or not results["ids"][0]:
+            return None
+
+        # Cosine distance is 1 - similarity
+        if results["distances"][0][0] >= 1 - self.threshold:
+            return None
+
+        metadata = results["metadatas"][0][0]
+        return {
+            "answer": metadata["answer"],
+            "sources": json.loads(metadata["sources"])
+        }
+
+    def set(self, question: str, vector: List[float], ctx_hash: str, answer: str, sources: List[Dict[str, Any]]) -> None:
+        """
+        Store an answer for a question and context.
+
+        Args:
+            question: Question the answer was generated for
+            vector: Question embedding
+            ctx_hash: Hash of the retrieved context
+            answer: Generated answer
+            sources: Sources cited by the answer
+        """
+        try:
+            self.collection.upsert(
+                ids=[hashlib.sha256(question.encode("utf-8")).hexdigest()],
+                embeddings=[vector],
+                metadatas=[{
+                    "ctx_hash": ctx_hash,
+                    "ts": time.time(),
+                    "answer": answer,
+                    "sources": json.dumps(sources)
+                }]
+            )
+        except Exception:
+            logger.exception("⚠️  SDK answer cache store error")